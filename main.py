@@ -1,5 +1,6 @@
 import sys
 import ctypes
+import argparse
 from src.utils import is_admin, run_as_admin
 from src.gui import run_app
 
@@ -9,11 +10,18 @@ def hide_console():
         ctypes.windll.user32.ShowWindow(ctypes.windll.kernel32.GetConsoleWindow(), 0)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FPS Booster")
+    parser.add_argument("--replay", metavar="TRACE", help="Replay a recorded trace instead of live processes")
+    args = parser.parse_args()
+
     # Hide the console window before running the app
     hide_console()
 
+    # Replaying a trace does not touch live processes, so no admin rights are needed
+    if args.replay:
+        run_app(replay_path=args.replay)
     # Check for admin rights
-    if not is_admin():
+    elif not is_admin():
         run_as_admin()
     else:
         run_app()
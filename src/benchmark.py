@@ -0,0 +1,92 @@
+"""
+Benchmark harness for the target boost profile.
+
+Runs a CPU-bound synthetic "game" next to background CPU burners and reports the game's
+throughput (frames per second) before and after the profile is applied. Only the processes
+spawned by the harness are touched.
+
+    python -m src.benchmark --burners 8 --duration 5
+"""
+import argparse
+import multiprocessing
+import time
+
+import psutil
+
+from src.target_profile import create_target_profile, apply_target_profile, revert_target_profile
+
+# Work done per synthetic frame
+FRAME_WORK = 20000
+
+
+def game_worker(frame_counter, stop_event):
+    """Synthetic game loop: count frames of fixed CPU work."""
+    while not stop_event.is_set():
+        total = 0
+        for i in range(FRAME_WORK):
+            total += i * i
+        with frame_counter.get_lock():
+            frame_counter.value += 1
+
+
+def burner_worker(stop_event):
+    """Background process that burns CPU."""
+    while not stop_event.is_set():
+        sum(i * i for i in range(FRAME_WORK))
+
+
+def measure_fps(frame_counter, duration):
+    """Return the frames per second produced during duration seconds."""
+    start_frames = frame_counter.value
+    start = time.perf_counter()
+    time.sleep(duration)
+    elapsed = time.perf_counter() - start
+    return (frame_counter.value - start_frames) / elapsed
+
+
+def run_benchmark(burners=None, duration=5.0, reserve_count=None):
+    """Run the baseline and boosted phases and return (baseline_fps, boosted_fps)."""
+    burners = burners or (psutil.cpu_count(logical=True) or 1) * 2
+    stop_event = multiprocessing.Event()
+    frame_counter = multiprocessing.Value('L', 0)
+
+    game = multiprocessing.Process(target=game_worker, args=(frame_counter, stop_event))
+    workers = [multiprocessing.Process(target=burner_worker, args=(stop_event,)) for _ in range(burners)]
+    game.start()
+    for worker in workers:
+        worker.start()
+
+    process_map = {p.pid: psutil.Process(p.pid) for p in [game] + workers}
+    profile = create_target_profile(pid=game.pid, reserve_count=reserve_count)
+
+    try:
+        time.sleep(1.0)  # Let the scheduler settle
+        baseline_fps = measure_fps(frame_counter, duration)
+
+        apply_target_profile(profile, process_map)
+        boosted_fps = measure_fps(frame_counter, duration)
+    finally:
+        revert_target_profile(profile)
+        stop_event.set()
+        for p in [game] + workers:
+            p.join(timeout=5)
+
+    return baseline_fps, boosted_fps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the target boost profile.")
+    parser.add_argument("--burners", type=int, default=None, help="Number of background CPU burners")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per phase")
+    parser.add_argument("--reserve", type=int, default=None, help="Cores reserved for the game")
+    args = parser.parse_args()
+
+    baseline_fps, boosted_fps = run_benchmark(args.burners, args.duration, args.reserve)
+    gain = (boosted_fps / baseline_fps - 1) * 100 if baseline_fps else 0.0
+    print(f"Baseline: {baseline_fps:.1f} frames/s")
+    print(f"Boosted:  {boosted_fps:.1f} frames/s")
+    print(f"Gain:     {gain:+.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+from array import array
+
+from src.rule_matcher import normalize_name, normalize_path
+
+# Vectorized group-by (optional)
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Metrics summed per group
+GROUP_METRICS = ('cpu_percent', 'memory_percent', 'read_bps', 'write_bps', 'ctx_switches_ps', 'gpu_percent')
+
+
+def name_key(proc_data):
+    """Group key: normalized process name."""
+    return normalize_name(proc_data['name'])
+
+
+def path_key(proc_data):
+    """Group key: normalized executable path, falling back to the name when it is unreadable."""
+    exe = proc_data.get('exe')
+    return normalize_path(exe) if exe else name_key(proc_data)
+
+
+def snapshot_columns(process_list, metrics=GROUP_METRICS):
+    """Turn a list of process dicts into one array per metric."""
+    return {metric: array('d', [p.get(metric, 0.0) for p in process_list]) for metric in metrics}
+
+
+def group_codes_numpy(keys):
+    unique_keys, codes = np.unique(np.array(keys, dtype=object).astype(str), return_inverse=True)
+    return list(unique_keys), codes
+
+
+def group_codes_python(keys):
+    index = {}
+    codes = array('l', [index.setdefault(key, len(index)) for key in keys])
+    return list(index), codes
+
+
+def aggregate(keys, columns):
+    """
+    Group-by over snapshot columns.
+    Returns (group keys, member row indexes per group, {metric: sums per group}).
+    """
+    if not keys:
+        return [], [], {metric: [] for metric in columns}
+
+    if HAS_NUMPY:
+        group_keys, codes = group_codes_numpy(keys)
+        group_count = len(group_keys)
+        sums = {metric: np.bincount(codes, weights=np.frombuffer(values, dtype=np.float64),
+                                    minlength=group_count).tolist()
+                for metric, values in columns.items()}
+        order = np.argsort(codes, kind="stable")
+        boundaries = np.cumsum(np.bincount(codes, minlength=group_count))[:-1]
+        members = [part.tolist() for part in np.split(order, boundaries)]
+        return group_keys, members, sums
+
+    group_keys, codes = group_codes_python(keys)
+    group_count = len(group_keys)
+    members = [[] for _ in range(group_count)]
+    for row, code in enumerate(codes):
+        members[code].append(row)
+    sums = {}
+    for metric, values in columns.items():
+        totals = [0.0] * group_count
+        for code, value in zip(codes, values):
+            totals[code] += value
+        sums[metric] = totals
+    return group_keys, members, sums
+
+
+def group_processes(process_list, key_func=name_key, metrics=GROUP_METRICS):
+    """
+    Aggregate a snapshot by application.
+    Returns one dict per group with key, count, pids, members (the process dicts) and summed metrics.
+    """
+    keys = [key_func(p) for p in process_list]
+    group_keys, members, sums = aggregate(keys, snapshot_columns(process_list, metrics))
+
+    groups = []
+    for i, key in enumerate(group_keys):
+        rows = [process_list[row] for row in members[i]]
+        group = {
+            'key': key,
+            'name': rows[0]['name'],
+            'count': len(rows),
+            'pids': [p['pid'] for p in rows],
+            'members': rows
+        }
+        for metric in metrics:
+            group[metric] = sums[metric][i]
+        groups.append(group)
+    return groups
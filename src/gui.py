@@ -3,13 +3,50 @@
 import sys
 import psutil
 import os
-from collections import deque
+import time
 from PyQt5 import QtWidgets, QtGui, QtCore
 from PyQt5.QtCore import Qt
 
-# from process_manager import safe_kill, is_process_blacklisted
-# We'll assume you have safe_kill in a separate module. If not, define your safe_kill here.
-from src.process_manager import safe_kill
+from src.process_manager import (
+    safe_kill,
+    safe_kill_many,
+    filter_soft_boost_targets,
+    whitelist_matcher,
+    blacklist_matcher
+)
+from src.sampler import (
+    MetricSampler,
+    METRIC_HISTORIES,
+    collection_cost,
+    EXPENSIVE_ATTRIBUTES,
+    attribute_value,
+    rank_processes
+)
+from src.leak_detector import LeakDetector
+from src.thread_monitor import ThreadMonitor
+from src.grouping import group_processes, name_key, path_key
+from src.rule_matcher import entry_error, lookup_exe, normalize_name
+from src.trace import TraceRecorder, TraceReplaySource, new_trace_path, latest_values
+from src.soft_boost import (
+    ACTION_KILL,
+    ACTION_DEMOTE,
+    ACTION_AFFINITY,
+    ACTION_SUSPEND,
+    soft_boost,
+    restore_all,
+    load_boost_records,
+    load_boost_rules,
+    match_boost_rule,
+    cpu_freed
+)
+from src.target_profile import (
+    create_target_profile,
+    apply_target_profile,
+    revert_target_profile,
+    target_running
+)
+from src.watchdog import EnforcementWatchdog
+from src.metrics_exporter import MetricsExporter, DEFAULT_PORT, PROCESS_GAUGES
 from src.utils import (
     load_cached_processes,
     save_cached_processes,
@@ -22,20 +59,88 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 STYLES_PATH = os.path.join(BASE_DIR, "assets", "style.qss")
 LOGO_PATH = os.path.join(BASE_DIR, "assets", "logo.png")
 
-
-
-############################################################
-# PLACEHOLDER if you need is_process_blacklisted from process_manager
-############################################################
-def is_process_blacklisted(proc_name_lower):
-    blacklist = load_json_file(USER_BLACKLIST_FILE, "user_defined_blacklist")
-    return proc_name_lower in [b.lower() for b in blacklist]
+# Boost action dropdown entries: label -> action
+BOOST_ACTIONS = {
+    "Kill": ACTION_KILL,
+    "Lower Priority": ACTION_DEMOTE,
+    "Restrict Affinity": ACTION_AFFINITY,
+    "Suspend": ACTION_SUSPEND
+}
+
+
+
+# Placeholder for the Manage Lists rule entry boxes
+RULE_ENTRY_HINT = "name.exe, *glob*.exe, re:regex, C:\\path\\prefix or sha256:digest"
+
+# Advanced table column -> metric it displays (only visible columns are collected)
+COLUMN_METRICS = {
+    3: 'cpu_percent',
+    4: 'memory_percent',
+    5: 'read_bps',
+    6: 'write_bps',
+    7: 'ctx_switches_ps',
+    8: 'gpu_percent',
+    9: 'is_system',
+    10: 'leak_rate',
+    11: 'exe',
+    12: 'username',
+    13: 'uss',
+    14: 'open_files',
+    15: 'connections',
+    16: 'cmdline'
+}
+
+# Metrics shown by the Basic tab table
+BASIC_METRICS = {'cpu_percent', 'memory_percent'}
+
+# Always collected: memory feeds the leak detector, which needs an unbroken history
+ALWAYS_METRICS = {'cpu_percent', 'memory_percent'}
+
+# Metrics shown by the grouped view
+GROUP_VIEW_METRICS = {'cpu_percent', 'memory_percent', 'read_bps', 'write_bps'}
+
+# Advanced table columns hidden until the user enables them
+DEFAULT_HIDDEN_COLUMNS = (9, 11, 12, 13, 14, 15, 16)
+
+# Expensive attribute readings older than this are greyed out
+STALE_ATTRIBUTE_SECONDS = 60
+
+# Advanced tab sort option -> metric key (sorted descending)
+SORT_METRICS = {
+    "CPU Usage": 'cpu_percent',
+    "Memory Usage": 'memory_percent',
+    "GPU Usage": 'gpu_percent',
+    "Disk Read": 'read_bps',
+    "Disk Write": 'write_bps',
+    "Context Switches": 'ctx_switches_ps',
+    "Leak Rate": 'leak_rate'
+}
+
+def format_rate(value, unit="B/s"):
+    """Format a per-second rate with a K/M/G suffix."""
+    for prefix in ("", "K", "M", "G"):
+        if value < 1024 or prefix == "G":
+            return f"{value:.1f} {prefix}{unit}"
+        value /= 1024
+
+def average(history):
+    return sum(history) / len(history) if len(history) > 0 else 0
+
+def attribute_item(text, age):
+    """Table item for an expensive attribute, showing how old the reading is."""
+    if age is None:
+        return QtWidgets.QTableWidgetItem("")
+    item = QtWidgets.QTableWidgetItem("N/A" if text is None else str(text))
+    item.setToolTip(f"Read {age:.0f} s ago")
+    if age >= STALE_ATTRIBUTE_SECONDS:
+        item.setForeground(QtGui.QBrush(QtGui.QColor("gray")))
+    return item
 
 ############################################################
 # MAIN CLASS
 ############################################################
 class FPSBoosterApp(QtWidgets.QWidget):
-    def __init__(self):
+    def __init__(self, replay=None):
         super().__init__()
         self.setWindowTitle("FPS Booster")
         self.resize(1200, 800)
@@ -52,17 +157,52 @@ class FPSBoosterApp(QtWidgets.QWidget):
         # How many samples we keep per PID
         self.history_size = 3
 
+        # Collects only the metrics the current view needs
+        self.sampler = MetricSampler(self.history_size)
+
+        # Long-term memory growth trends
+        self.leak_detector = LeakDetector()
+
+        # Per-thread drill-down (only alive while the pane is open)
+        self.thread_monitor = None
+        self.thread_timer = None
+
         self.cached_processes = load_cached_processes()
         self.timer = None
 
+        # Trace recording, or a recorded trace replayed in place of live sampling
+        self.recorder = None
+        self.replay = replay
+
+        # Soft boost rules (their metrics are always collected)
+        self.boost_rules = load_boost_rules()
+
+        # Foreground/target boost profile (None when no target is set)
+        self.target_profile = None
+
+        # Opt-in blacklist enforcement between full refreshes (polls on its own thread)
+        self.watchdog = None
+
+        # Optional metrics endpoint and the counters it exports
+        self.exporter = None
+        self.action_counts = {}  # (source, action) -> count
+        self.refresh_seconds = 0.0
+        self.collection_cost = 0  # Declared provider cost x processes of the last sampling pass
+
         # For the Advanced tab
         self.filter_text = ""
         self.filter_blacklisted_only = False
 
-        # Number of logical cores for CPU usage scaling
-        self.num_cores = psutil.cpu_count(logical=True)
+        # Grouped view state, kept across refreshes
+        self.checked_groups = set()
+        self.expanded_groups = set()
+        self.exe_cache = {}  # (pid, create_time) -> executable path, for grouping by path
 
+        # Process name -> table rows, so checking one row syncs its duplicates without a rescan
+        self.rows_by_name = {}
         self.init_ui()
+        if self.replay is not None:
+            self.enter_replay_mode(self.replay.reader.path)
         self.start_auto_refresh()
 
     ############################################################
@@ -95,6 +235,52 @@ class FPSBoosterApp(QtWidgets.QWidget):
     def on_tab_changed(self, index):
         if self.tabs.tabText(index) == "Manage Lists":
             self.load_manage_lists()
+        else:
+            self.backfill_metrics()
+
+    def required_metrics(self):
+        """Metrics needed by the visible table, the sort key and the boost rules."""
+        metrics = set(ALWAYS_METRICS)
+        current_tab = self.tabs.currentWidget()
+        if current_tab is self.basic_tab:
+            metrics |= BASIC_METRICS
+        elif current_tab is self.advanced_tab and self.group_checkbox.isChecked():
+            metrics |= GROUP_VIEW_METRICS
+        elif current_tab is self.advanced_tab:
+            for column, metric in COLUMN_METRICS.items():
+                if not self.table.isColumnHidden(column):
+                    metrics.add(metric)
+            sort_metric = SORT_METRICS.get(self.sort_dropdown.currentText())
+            if sort_metric:
+                metrics.add(sort_metric)
+
+        for rule in self.boost_rules:
+            metrics |= set(rule.get("when", {}))
+        if self.exporter is not None:
+            metrics |= set(PROCESS_GAUGES)
+        return metrics
+
+    def backfill_metrics(self):
+        """Collect newly needed metrics right away and redraw the visible table."""
+        metrics = self.required_metrics()
+        backfilled = self.sampler.backfill(self.process_map, self.rolling_usage, metrics)
+        if self.sample_attributes(metrics) or backfilled:
+            self.load_visible_table()
+
+    def sample_attributes(self, metrics):
+        """Refresh the needed expensive attributes within the per-pass time budget."""
+        attributes = metrics & set(EXPENSIVE_ATTRIBUTES)
+        if not attributes:
+            return 0
+        return self.sampler.sample_attributes(self.process_map, self.rolling_usage, attributes,
+                                              rank_processes(self.rolling_usage))
+
+    def load_visible_table(self):
+        current_tab = self.tabs.currentWidget()
+        if current_tab is self.basic_tab:
+            self.load_basic_table()
+        elif current_tab is self.advanced_tab:
+            self.load_processes()
 
     ############################################################
     # 2) Manage Lists Tab
@@ -112,6 +298,16 @@ class FPSBoosterApp(QtWidgets.QWidget):
         self.whitelist_table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
         whitelist_layout.addWidget(self.whitelist_table)
 
+        # Free-form rule entry (names, globs, regexes, paths, hashes)
+        whitelist_entry_layout = QtWidgets.QHBoxLayout()
+        self.whitelist_entry = QtWidgets.QLineEdit()
+        self.whitelist_entry.setPlaceholderText(RULE_ENTRY_HINT)
+        whitelist_entry_layout.addWidget(self.whitelist_entry)
+        self.add_whitelist_entry_btn = QtWidgets.QPushButton("Add Rule")
+        self.add_whitelist_entry_btn.clicked.connect(self.add_whitelist_entry)
+        whitelist_entry_layout.addWidget(self.add_whitelist_entry_btn)
+        whitelist_layout.addLayout(whitelist_entry_layout)
+
         self.remove_whitelist_btn = QtWidgets.QPushButton("Remove from Whitelist")
         self.remove_whitelist_btn.clicked.connect(self.remove_from_whitelist)
         whitelist_layout.addWidget(self.remove_whitelist_btn)
@@ -129,6 +325,15 @@ class FPSBoosterApp(QtWidgets.QWidget):
         self.blacklist_table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
         blacklist_layout.addWidget(self.blacklist_table)
 
+        blacklist_entry_layout = QtWidgets.QHBoxLayout()
+        self.blacklist_entry = QtWidgets.QLineEdit()
+        self.blacklist_entry.setPlaceholderText(RULE_ENTRY_HINT)
+        blacklist_entry_layout.addWidget(self.blacklist_entry)
+        self.add_blacklist_entry_btn = QtWidgets.QPushButton("Add Rule")
+        self.add_blacklist_entry_btn.clicked.connect(self.add_blacklist_entry)
+        blacklist_entry_layout.addWidget(self.add_blacklist_entry_btn)
+        blacklist_layout.addLayout(blacklist_entry_layout)
+
         self.remove_blacklist_btn = QtWidgets.QPushButton("Remove from Blacklist")
         self.remove_blacklist_btn.clicked.connect(self.remove_from_blacklist)
         blacklist_layout.addWidget(self.remove_blacklist_btn)
@@ -154,6 +359,38 @@ class FPSBoosterApp(QtWidgets.QWidget):
             self.blacklist_table.insertRow(row)
             self.blacklist_table.setItem(row, 0, QtWidgets.QTableWidgetItem(process))
 
+    def add_whitelist_entry(self):
+        entry = self.whitelist_entry.text().strip()
+        if not entry:
+            return
+        error = entry_error(entry)
+        if error:
+            QtWidgets.QMessageBox.warning(self, "Whitelist", f"{entry} was not added. {error}")
+            return
+        whitelist = load_json_file(USER_WHITELIST_FILE, "user_defined_whitelist")
+        if entry not in whitelist:
+            whitelist.append(entry)
+            save_json_file(USER_WHITELIST_FILE, "user_defined_whitelist", whitelist)
+            self.refresh_watchdog_lists()
+        self.whitelist_entry.clear()
+        self.load_manage_lists()
+
+    def add_blacklist_entry(self):
+        entry = self.blacklist_entry.text().strip()
+        if not entry:
+            return
+        error = entry_error(entry)
+        if error:
+            QtWidgets.QMessageBox.warning(self, "Blacklist", f"{entry} was not added. {error}")
+            return
+        blacklist = load_json_file(USER_BLACKLIST_FILE, "user_defined_blacklist")
+        if entry not in blacklist:
+            blacklist.append(entry)
+            save_json_file(USER_BLACKLIST_FILE, "user_defined_blacklist", blacklist)
+            self.refresh_watchdog_lists()
+        self.blacklist_entry.clear()
+        self.load_manage_lists()
+
     ############################################################
     # 3) Basic Mode Tab
     ############################################################
@@ -186,6 +423,44 @@ class FPSBoosterApp(QtWidgets.QWidget):
         self.one_click_boost_btn.clicked.connect(self.handle_one_click_boost)
         layout.addWidget(self.one_click_boost_btn, alignment=Qt.AlignCenter)
 
+        # Soft boost: choose what One-Click Boost does to blacklisted processes
+        boost_action_layout = QtWidgets.QHBoxLayout()
+        boost_action_layout.addWidget(QtWidgets.QLabel("Boost action:"))
+
+        self.boost_action_dropdown = QtWidgets.QComboBox()
+        self.boost_action_dropdown.addItems(list(BOOST_ACTIONS))
+        boost_action_layout.addWidget(self.boost_action_dropdown)
+
+        self.restore_btn = QtWidgets.QPushButton("Restore")
+        self.restore_btn.clicked.connect(self.handle_restore)
+        boost_action_layout.addWidget(self.restore_btn)
+
+        self.soft_boost_label = QtWidgets.QLabel()
+        boost_action_layout.addWidget(self.soft_boost_label)
+        boost_action_layout.addStretch()
+
+        layout.addLayout(boost_action_layout)
+
+        # Auto-enforcement of the blacklist on new processes
+        enforce_layout = QtWidgets.QHBoxLayout()
+        self.enforce_checkbox = QtWidgets.QCheckBox("Auto-enforce blacklist on new processes")
+        self.enforce_checkbox.stateChanged.connect(self.toggle_enforcement)
+        enforce_layout.addWidget(self.enforce_checkbox)
+
+        self.enforce_label = QtWidgets.QLabel()
+        enforce_layout.addWidget(self.enforce_label)
+        enforce_layout.addStretch()
+
+        layout.addLayout(enforce_layout)
+
+        self.exporter_checkbox = QtWidgets.QCheckBox(f"Serve metrics on localhost:{DEFAULT_PORT}/metrics")
+        self.exporter_checkbox.stateChanged.connect(self.toggle_exporter)
+        layout.addWidget(self.exporter_checkbox)
+
+        self.record_checkbox = QtWidgets.QCheckBox("Record snapshots to a trace file")
+        self.record_checkbox.stateChanged.connect(self.toggle_recording)
+        layout.addWidget(self.record_checkbox)
+
         self.basic_table = QtWidgets.QTableWidget()
         self.basic_table.setColumnCount(4)
         self.basic_table.setHorizontalHeaderLabels(["PID", "Process Name", "CPU %", "Memory %"])
@@ -200,29 +475,7 @@ class FPSBoosterApp(QtWidgets.QWidget):
         self.basic_tab.setLayout(layout)
 
     def load_basic_table(self):
-        process_list = []
-        for pid, proc in self.process_map.items():
-            try:
-                name = proc.name()
-                if pid not in self.rolling_usage:
-                    continue
-
-                cpu_deque = self.rolling_usage[pid]["cpu_history"]
-                if len(cpu_deque) == 0:
-                    continue
-
-                avg_cpu = sum(cpu_deque) / len(cpu_deque)
-                mem_deque = self.rolling_usage[pid]["mem_history"]
-                avg_mem = sum(mem_deque) / len(mem_deque) if len(mem_deque) > 0 else 0
-
-                process_list.append({
-                    'pid': pid,
-                    'name': name,
-                    'cpu_percent': avg_cpu,
-                    'memory_percent': avg_mem
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+        process_list = self.build_process_list()
 
         # Sort descending by CPU
         process_list.sort(key=lambda x: x['cpu_percent'], reverse=True)
@@ -241,39 +494,177 @@ class FPSBoosterApp(QtWidgets.QWidget):
         self.basic_table.setUpdatesEnabled(True)
 
     def handle_one_click_boost(self):
-        process_list = []
-        for pid, proc in self.process_map.items():
-            if pid not in self.rolling_usage:
-                continue
-
-            # Get the process name
-            name = proc.name()
-            process_list.append({
-                'pid': pid,
-                'name': name,
-            })
+        process_list = self.build_process_list()
 
         # Sort processes alphabetically for consistent behavior (optional)
         process_list.sort(key=lambda x: x['name'].lower())
 
+        action = BOOST_ACTIONS[self.boost_action_dropdown.currentText()]
+        self.boost_rules = load_boost_rules()
+        rules = self.boost_rules
+        cpu_usage = self.current_cpu_usage()
+
+        # Evaluate the list rules against the whole snapshot in one pass
+        blacklisted = blacklist_matcher().match_snapshot(process_list)
+        whitelisted = whitelist_matcher().match_snapshot(process_list)
+
         kill_count = 0
+        soft_targets = {}
         for item in process_list:
             pid = item['pid']
-            real_name = item['name'].split()[0]
-            lower_name = real_name.lower()
 
-            # Only kill processes that are explicitly blacklisted
-            if is_process_blacklisted(lower_name):
-                if safe_kill(pid, parent_window=self):
-                    kill_count += 1
+            # Blacklisted processes get the selected action, unless a (broader) whitelist entry protects them
+            if pid in blacklisted and pid not in whitelisted:
+                if action == ACTION_KILL:
+                    if safe_kill(pid, parent_window=self):
+                        kill_count += 1
+                        self.count_action("one_click", ACTION_KILL)
+                else:
+                    soft_targets.setdefault(action, []).append(pid)
+                continue
+
+            # Other processes are only touched by a matching boost rule (never killed)
+            if rules and pid not in blacklisted and pid not in whitelisted:
+                rule_action = match_boost_rule(item, rules)
+                if rule_action and rule_action != ACTION_KILL:
+                    soft_targets.setdefault(rule_action, []).append(pid)
+
+        # Same protections as a kill, with a single prompt for the whole batch
+        allowed, skipped = filter_soft_boost_targets(
+            [pid for pids in soft_targets.values() for pid in pids], parent_window=self)
+        allowed = set(allowed)
+
+        boosted_count = 0
+        for soft_action, pids in soft_targets.items():
+            boosted = soft_boost([pid for pid in pids if pid in allowed], soft_action, cpu_usage)
+            self.count_action("one_click", soft_action, boosted)
+            boosted_count += boosted
+
+        self.update_soft_boost_label()
 
-        # Show a message box with the number of killed processes
+        # Show a message box with the number of affected processes
         QtWidgets.QMessageBox.information(
             self,
             "One-Click Boost",
-            f"Killed {kill_count} blacklisted processes!"
+            f"Killed {kill_count} blacklisted processes!\n"
+            f"Soft-boosted {boosted_count} processes.\n"
+            f"Skipped {skipped} protected processes."
         )
 
+    def handle_restore(self):
+        # Restore undoes the boost target too; otherwise its pids would never be pinned again
+        self.clear_boost_target()
+        restored = restore_all()
+        self.update_soft_boost_label()
+        QtWidgets.QMessageBox.information(
+            self,
+            "Restore",
+            f"Restored {restored} soft-boosted processes."
+        )
+
+    def toggle_enforcement(self, state):
+        if state == Qt.Checked:
+            self.watchdog = EnforcementWatchdog(BOOST_ACTIONS[self.boost_action_dropdown.currentText()])
+            self.refresh_watchdog_lists()
+            self.watchdog.start(0.1)  # Keeps spawn-to-action latency well under 250 ms
+            self.boost_action_dropdown.currentTextChanged.connect(self.update_watchdog_action)
+        else:
+            self.watchdog.stop()
+            # Keep the exported counters monotonic across toggles
+            for action, count in self.watchdog.stats()["actions"].items():
+                self.count_action("watchdog", action, count)
+            self.boost_action_dropdown.currentTextChanged.disconnect(self.update_watchdog_action)
+            self.watchdog = None
+        self.update_enforcement_label()
+
+    def update_watchdog_action(self, label):
+        self.watchdog.action = BOOST_ACTIONS[label]
+
+    def refresh_watchdog_lists(self):
+        if self.watchdog is not None:
+            self.watchdog.set_blacklist(blacklist_matcher())
+            self.watchdog.set_whitelist(whitelist_matcher())
+
+    def update_enforcement_label(self):
+        if self.watchdog is None:
+            self.enforce_label.setText("")
+            return
+        stats = self.watchdog.stats()
+        text = (f"{sum(stats['actions'].values())} enforced, "
+                f"avg {stats['avg_latency'] * 1000:.0f} ms, "
+                f"p95 {stats['p95_latency'] * 1000:.0f} ms, "
+                f"{stats['over_target']} over target, "
+                f"{stats['skipped_protected']} protected skipped")
+        if stats['in_backoff']:
+            text += f", backing off: {', '.join(stats['in_backoff'])}"
+        self.enforce_label.setText(text)
+
+    def toggle_exporter(self, state):
+        if state == Qt.Checked:
+            self.exporter = MetricsExporter()
+            try:
+                self.exporter.start()
+            except OSError as e:
+                self.exporter = None
+                QtWidgets.QMessageBox.warning(self, "Metrics", f"Could not start the metrics endpoint: {e}")
+                self.exporter_checkbox.setChecked(False)
+                return
+            self.backfill_metrics()
+            self.publish_metrics()
+        elif self.exporter is not None:
+            self.exporter.stop()
+            self.exporter = None
+
+    def toggle_recording(self, state):
+        if state == Qt.Checked:
+            self.recorder = TraceRecorder(new_trace_path())
+        elif self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def enter_replay_mode(self, replay_path):
+        """Show a recorded trace; actions are disabled because its PIDs are not live."""
+        self.setWindowTitle(f"FPS Booster (Replay: {os.path.basename(replay_path)})")
+        for widget in (self.one_click_boost_btn, self.kill_btn, self.soft_boost_btn,
+                       self.set_target_btn, self.show_threads_btn, self.enforce_checkbox,
+                       self.record_checkbox):
+            widget.setEnabled(False)
+
+    def count_action(self, source, action, count=1):
+        key = (source, action)
+        self.action_counts[key] = self.action_counts.get(key, 0) + count
+
+    def publish_metrics(self):
+        if self.exporter is None:
+            return
+        actions = dict(self.action_counts)
+        if self.watchdog is not None:
+            # Live watchdog counters on top of those of previous enforcement sessions
+            for action, count in self.watchdog.stats()["actions"].items():
+                actions[("watchdog", action)] = actions.get(("watchdog", action), 0) + count
+        self.exporter.publish(self.build_process_list(), {
+            "actions": actions,
+            "refresh_seconds": self.refresh_seconds,
+            "collection_cost": self.collection_cost
+        })
+
+    def current_cpu_usage(self):
+        """Return pid -> rolling average CPU %."""
+        cpu_usage = {}
+        for pid, usage in self.rolling_usage.items():
+            cpu_deque = usage["cpu_history"]
+            if len(cpu_deque) > 0:
+                cpu_usage[pid] = sum(cpu_deque) / len(cpu_deque)
+        return cpu_usage
+
+    def update_soft_boost_label(self):
+        records = load_boost_records()
+        if not records:
+            self.soft_boost_label.setText("")
+            return
+        freed = cpu_freed(records, self.current_cpu_usage())
+        self.soft_boost_label.setText(f"{len(records)} soft-boosted, ~{freed:.2f}% CPU freed")
+
     ############################################################
     # 4) Advanced Mode Tab
     ############################################################
@@ -289,19 +680,51 @@ class FPSBoosterApp(QtWidgets.QWidget):
         filter_layout.addWidget(self.search_box)
 
         self.sort_dropdown = QtWidgets.QComboBox()
-        self.sort_dropdown.addItems(["CPU Usage", "Memory Usage", "Alphabetical", "GPU Usage"])
-        self.sort_dropdown.currentIndexChanged.connect(self.load_processes)
+        self.sort_dropdown.addItems(["CPU Usage", "Memory Usage", "Alphabetical", "GPU Usage",
+                                     "Disk Read", "Disk Write", "Context Switches", "Leak Rate"])
+        self.sort_dropdown.currentIndexChanged.connect(self.on_sort_changed)
         filter_layout.addWidget(self.sort_dropdown)
 
         self.blacklist_checkbox = QtWidgets.QCheckBox("Show only blacklisted processes")
         self.blacklist_checkbox.stateChanged.connect(self.toggle_blacklist_filter)
         filter_layout.addWidget(self.blacklist_checkbox)
 
+        self.group_checkbox = QtWidgets.QCheckBox("Group by application")
+        self.group_checkbox.stateChanged.connect(self.toggle_grouped_view)
+        filter_layout.addWidget(self.group_checkbox)
+
+        self.group_mode_dropdown = QtWidgets.QComboBox()
+        self.group_mode_dropdown.addItems(["By Name", "By Path"])
+        self.group_mode_dropdown.currentIndexChanged.connect(self.load_processes)
+        filter_layout.addWidget(self.group_mode_dropdown)
+
         layout.addLayout(filter_layout)
 
+        # Grouped view: one expandable row per application (hidden until enabled)
+        self.group_tree = QtWidgets.QTreeWidget()
+        self.group_tree.setColumnCount(6)
+        self.group_tree.setHeaderLabels(["Application", "Processes", "CPU %", "Memory %", "Disk Read", "Disk Write"])
+        self.group_tree.header().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        self.group_tree.setAlternatingRowColors(True)
+        self.group_tree.itemExpanded.connect(self.on_group_expanded)
+        self.group_tree.itemCollapsed.connect(self.on_group_collapsed)
+        self.group_tree.itemChanged.connect(self.on_group_checked)
+        self.group_tree.itemSelectionChanged.connect(self.on_table_selection_changed)
+        self.group_tree.hide()
+        layout.addWidget(self.group_tree)
+
         self.table = QtWidgets.QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["Select", "PID", "Process Name", "CPU %", "Memory %", "GPU %"])
+        self.table.setColumnCount(17)
+        self.table.setHorizontalHeaderLabels(["Select", "PID", "Process Name", "CPU %", "Memory %",
+                                              "Disk Read", "Disk Write", "Ctx Sw/s", "GPU %", "System",
+                                              "Leaking", "Executable", "User", "USS", "Open Files",
+                                              "Connections", "Command Line"])
+        for column in DEFAULT_HIDDEN_COLUMNS:
+            self.table.setColumnHidden(column, True)
+
+        # Right-click the header to choose which metric columns are shown (and collected)
+        self.table.horizontalHeader().setContextMenuPolicy(Qt.CustomContextMenu)
+        self.table.horizontalHeader().customContextMenuRequested.connect(self.show_column_menu)
         self.table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(2, QtWidgets.QHeaderView.Stretch)
         self.table.setAlternatingRowColors(True)
@@ -312,6 +735,31 @@ class FPSBoosterApp(QtWidgets.QWidget):
 
         layout.addWidget(self.table)
 
+        # Thread drill-down pane for the selected process (hidden until opened)
+        self.thread_pane = QtWidgets.QGroupBox("Thread Details")
+        thread_layout = QtWidgets.QVBoxLayout()
+
+        self.thread_label = QtWidgets.QLabel()
+        thread_layout.addWidget(self.thread_label)
+
+        self.thread_table = QtWidgets.QTableWidget()
+        self.thread_table.setColumnCount(4)
+        self.thread_table.setHorizontalHeaderLabels(["Thread ID", "CPU %", "User Time (s)", "System Time (s)"])
+        self.thread_table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
+        self.thread_table.setAlternatingRowColors(True)
+        thread_layout.addWidget(self.thread_table)
+
+        self.close_threads_btn = QtWidgets.QPushButton("Close Thread Details")
+        self.close_threads_btn.clicked.connect(self.close_thread_pane)
+        thread_layout.addWidget(self.close_threads_btn)
+
+        self.thread_pane.setLayout(thread_layout)
+        self.thread_pane.hide()
+        layout.addWidget(self.thread_pane)
+
+        # Follow the selection while the pane is open
+        self.table.itemSelectionChanged.connect(self.on_table_selection_changed)
+
         btn_layout = QtWidgets.QHBoxLayout()
         self.refresh_btn = QtWidgets.QPushButton("Refresh")
         self.refresh_btn.clicked.connect(self.load_processes)
@@ -320,6 +768,18 @@ class FPSBoosterApp(QtWidgets.QWidget):
         self.kill_btn = QtWidgets.QPushButton("Kill Selected")
         self.kill_btn.clicked.connect(self.kill_selected)
         btn_layout.addWidget(self.kill_btn)
+
+        self.soft_boost_btn = QtWidgets.QPushButton("Soft Boost Selected")
+        self.soft_boost_btn.clicked.connect(self.soft_boost_selected)
+        btn_layout.addWidget(self.soft_boost_btn)
+
+        self.show_threads_btn = QtWidgets.QPushButton("Show Threads")
+        self.show_threads_btn.clicked.connect(self.open_thread_pane)
+        btn_layout.addWidget(self.show_threads_btn)
+
+        self.restore_btn2 = QtWidgets.QPushButton("Restore All")
+        self.restore_btn2.clicked.connect(self.handle_restore)
+        btn_layout.addWidget(self.restore_btn2)
         layout.addLayout(btn_layout)
 
         # List Management Buttons
@@ -343,9 +803,171 @@ class FPSBoosterApp(QtWidgets.QWidget):
 
         layout.addLayout(list_mgmt_layout)
 
+        # Target boost profile
+        target_layout = QtWidgets.QHBoxLayout()
+
+        self.target_mode_dropdown = QtWidgets.QComboBox()
+        self.target_mode_dropdown.addItems(["Target by Name", "Target by PID"])
+        target_layout.addWidget(self.target_mode_dropdown)
+
+        self.set_target_btn = QtWidgets.QPushButton("Set Boost Target")
+        self.set_target_btn.clicked.connect(self.set_boost_target)
+        target_layout.addWidget(self.set_target_btn)
+
+        self.clear_target_btn = QtWidgets.QPushButton("Clear Boost Target")
+        self.clear_target_btn.clicked.connect(self.clear_boost_target)
+        target_layout.addWidget(self.clear_target_btn)
+
+        self.target_label = QtWidgets.QLabel("No boost target")
+        target_layout.addWidget(self.target_label)
+        target_layout.addStretch()
+
+        layout.addLayout(target_layout)
+
         self.advanced_tab.setLayout(layout)
 
+    def show_column_menu(self, pos):
+        menu = QtWidgets.QMenu(self)
+        # Declared cost of what is currently collected, so users can see what a column adds
+        cost_action = menu.addAction(f"Sampling cost: {collection_cost(self.required_metrics())} per process")
+        cost_action.setEnabled(False)
+        menu.addSeparator()
+        for column in COLUMN_METRICS:
+            action = menu.addAction(self.table.horizontalHeaderItem(column).text())
+            action.setCheckable(True)
+            action.setChecked(not self.table.isColumnHidden(column))
+            action.setData(column)
+        chosen = menu.exec_(self.table.horizontalHeader().mapToGlobal(pos))
+        if chosen is not None:
+            self.table.setColumnHidden(chosen.data(), not chosen.isChecked())
+            self.backfill_metrics()
+
+    def selected_processes(self):
+        """(pid, name) of the selected rows, or of the selected groups/members when grouped."""
+        if self.group_checkbox.isChecked():
+            processes = []
+            for item in self.group_tree.selectedItems():
+                processes.extend(zip(item.data(1, Qt.UserRole), item.data(2, Qt.UserRole)))
+            return processes
+        return [(int(self.table.item(index.row(), 1).text()), self.table.item(index.row(), 2).text())
+                for index in self.table.selectionModel().selectedRows()]
+
+    def selected_pid(self):
+        processes = self.selected_processes()
+        return processes[0][0] if processes else None
+
+    def open_thread_pane(self):
+        pid = self.selected_pid()
+        if pid is None:
+            QtWidgets.QMessageBox.information(self, "No Selection",
+                                              "Please select a process to show its threads.")
+            return
+        self.watch_threads(pid)
+
+    def watch_threads(self, pid):
+        try:
+            self.thread_monitor = ThreadMonitor(pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            self.thread_label.setText(f"Cannot read threads of PID {pid}")
+            self.thread_monitor = None
+            self.thread_table.setRowCount(0)
+            self.thread_pane.show()
+            return
+
+        self.thread_label.setText(f"{self.thread_monitor.name} (PID: {pid})")
+        self.thread_pane.show()
+        self.refresh_threads()
+        if self.thread_timer is None:
+            self.thread_timer = QtCore.QTimer()
+            self.thread_timer.timeout.connect(self.refresh_threads)
+            self.thread_timer.start(1000)  # Faster than the main refresh, only while open
+
+    def on_table_selection_changed(self):
+        if not self.thread_pane.isVisible():
+            return
+        pid = self.selected_pid()
+        # The table is rebuilt on every refresh, which clears the selection; keep the current PID then
+        if pid is not None and (self.thread_monitor is None or pid != self.thread_monitor.pid):
+            self.watch_threads(pid)
+
+    def refresh_threads(self):
+        if self.thread_monitor is None:
+            return
+        try:
+            threads = self.thread_monitor.sample()
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            self.thread_label.setText(f"{self.thread_monitor.name} (PID: {self.thread_monitor.pid}) has exited")
+            self.thread_monitor = None
+            return
+        except psutil.AccessDenied:
+            self.thread_label.setText(f"Cannot read threads of PID {self.thread_monitor.pid}")
+            self.thread_monitor = None
+            return
+
+        self.thread_table.setUpdatesEnabled(False)
+        self.thread_table.setRowCount(0)
+        for row, thread in enumerate(threads):
+            self.thread_table.insertRow(row)
+            self.thread_table.setItem(row, 0, QtWidgets.QTableWidgetItem(str(thread['id'])))
+            self.thread_table.setItem(row, 1, QtWidgets.QTableWidgetItem(f"{thread['cpu_percent']:.2f}"))
+            self.thread_table.setItem(row, 2, QtWidgets.QTableWidgetItem(f"{thread['user_time']:.2f}"))
+            self.thread_table.setItem(row, 3, QtWidgets.QTableWidgetItem(f"{thread['system_time']:.2f}"))
+        self.thread_table.setUpdatesEnabled(True)
+
+    def close_thread_pane(self):
+        if self.thread_timer is not None:
+            self.thread_timer.stop()
+            self.thread_timer = None
+        self.thread_monitor = None
+        self.thread_pane.hide()
+
+    def on_sort_changed(self):
+        self.backfill_metrics()
+        self.load_processes()
+
+    def build_process_list(self):
+        """Return one dict of rolling-average metrics per sampled process."""
+        process_list = []
+        now = time.monotonic()
+        for pid, usage in self.rolling_usage.items():
+            if len(usage["cpu_history"]) == 0:
+                continue
+
+            proc_data = {
+                'pid': pid,
+                'name': usage["name"],
+                'create_time': usage["create_time"]
+            }
+            for metric, history in METRIC_HISTORIES.items():
+                proc_data[metric] = average(usage[history])
+            # Expensive attributes carry the age of their last reading
+            for attribute in EXPENSIVE_ATTRIBUTES:
+                proc_data[attribute], proc_data[attribute + '_age'] = attribute_value(usage, attribute, now)
+            growth, _r2, leaking = self.leak_detector.result(pid)
+            proc_data['leak_rate'] = growth
+            proc_data['leaking'] = leaking
+            process_list.append(proc_data)
+        return process_list
+
+    def filtered_process_list(self):
+        """Rolling averages after the search and blacklist filters."""
+        full_list = self.build_process_list()
+
+        # Filter
+        if self.filter_text:
+            full_list = [p for p in full_list if self.filter_text in p['name'].lower()]
+
+        # Show only blacklisted?
+        if self.filter_blacklisted_only:
+            blacklisted = blacklist_matcher().match_snapshot(full_list)
+            full_list = [p for p in full_list if p['pid'] in blacklisted]
+        return full_list
+
     def load_processes(self):
+        if self.group_checkbox.isChecked():
+            self.load_groups()
+            return
+
         self.table.setUpdatesEnabled(False)
         try:
             self.table.itemChanged.disconnect(self.sync_checkbox_states)
@@ -362,51 +984,18 @@ class FPSBoosterApp(QtWidgets.QWidget):
                     self.selected_process_names.add(name_item.text().lower())
 
         self.table.setRowCount(0)
+        self.rows_by_name = {}
 
         # Build list from rolling averages
-        full_list = []
-        for pid, proc in self.process_map.items():
-            if pid not in self.rolling_usage:
-                continue
-
-            cpu_deque = self.rolling_usage[pid]["cpu_history"]
-            mem_deque = self.rolling_usage[pid]["mem_history"]
-            if len(cpu_deque) == 0:
-                continue
-
-            avg_cpu = sum(cpu_deque) / len(cpu_deque)
-            avg_mem = sum(mem_deque) / len(mem_deque) if len(mem_deque) > 0 else 0
-            name = proc.name()
-
-            # GPU usage placeholder
-            gpu_usage = 0.0
-
-            full_list.append({
-                'pid': pid,
-                'name': name,
-                'cpu_percent': avg_cpu,
-                'memory_percent': avg_mem,
-                'gpu_percent': gpu_usage
-            })
-
-        # Filter
-        if self.filter_text:
-            full_list = [p for p in full_list if self.filter_text in p['name'].lower()]
-
-        # Show only blacklisted?
-        if self.filter_blacklisted_only:
-            full_list = [p for p in full_list if is_process_blacklisted(p['name'].split()[0].lower())]
+        full_list = self.filtered_process_list()
 
         # Sort with checked processes at the top
         sort_option = self.sort_dropdown.currentText()
-        if sort_option == "CPU Usage":
-            full_list.sort(key=lambda x: (x['name'].lower() not in self.selected_process_names, -x['cpu_percent']))
-        elif sort_option == "Memory Usage":
-            full_list.sort(key=lambda x: (x['name'].lower() not in self.selected_process_names, -x['memory_percent']))
-        elif sort_option == "Alphabetical":
+        if sort_option == "Alphabetical":
             full_list.sort(key=lambda x: (x['name'].lower() not in self.selected_process_names, x['name'].lower()))
-        elif sort_option == "GPU Usage":
-            full_list.sort(key=lambda x: (x['name'].lower() not in self.selected_process_names, -x['gpu_percent']))
+        else:
+            metric = SORT_METRICS[sort_option]
+            full_list.sort(key=lambda x: (x['name'].lower() not in self.selected_process_names, -x[metric]))
 
         # Populate table
         for row, proc in enumerate(full_list):
@@ -426,6 +1015,7 @@ class FPSBoosterApp(QtWidgets.QWidget):
 
             name_item = QtWidgets.QTableWidgetItem(proc['name'])
             self.table.setItem(row, 2, name_item)
+            self.rows_by_name.setdefault(proc['name'].lower(), []).append(row)
 
             cpu_item = QtWidgets.QTableWidgetItem(f"{proc['cpu_percent']:.2f}")
             self.table.setItem(row, 3, cpu_item)
@@ -433,13 +1023,135 @@ class FPSBoosterApp(QtWidgets.QWidget):
             mem_item = QtWidgets.QTableWidgetItem(f"{proc['memory_percent']:.2f}")
             self.table.setItem(row, 4, mem_item)
 
+            self.table.setItem(row, 5, QtWidgets.QTableWidgetItem(format_rate(proc['read_bps'])))
+            self.table.setItem(row, 6, QtWidgets.QTableWidgetItem(format_rate(proc['write_bps'])))
+            self.table.setItem(row, 7, QtWidgets.QTableWidgetItem(f"{proc['ctx_switches_ps']:.0f}"))
+
             gpu_val = f"{proc['gpu_percent']:.2f}" if proc['gpu_percent'] > 0 else "N/A"
             gpu_item = QtWidgets.QTableWidgetItem(gpu_val)
-            self.table.setItem(row, 5, gpu_item)
+            self.table.setItem(row, 8, gpu_item)
+
+            system_val = {True: "Yes", False: "No"}.get(proc['is_system'])
+            self.table.setItem(row, 9, attribute_item(system_val, proc['is_system_age']))
+
+            leak_val = f"+{format_rate(proc['leak_rate'], 'B/h')}" if proc['leaking'] else ""
+            self.table.setItem(row, 10, QtWidgets.QTableWidgetItem(leak_val))
+
+            uss_val = format_rate(proc['uss'], "B") if proc['uss'] is not None else None
+            self.table.setItem(row, 11, attribute_item(proc['exe'], proc['exe_age']))
+            self.table.setItem(row, 12, attribute_item(proc['username'], proc['username_age']))
+            self.table.setItem(row, 13, attribute_item(uss_val, proc['uss_age']))
+            self.table.setItem(row, 14, attribute_item(proc['open_files'], proc['open_files_age']))
+            self.table.setItem(row, 15, attribute_item(proc['connections'], proc['connections_age']))
+            self.table.setItem(row, 16, attribute_item(proc['cmdline'], proc['cmdline_age']))
 
         self.table.itemChanged.connect(self.sync_checkbox_states)
         self.table.setUpdatesEnabled(True)
 
+    def toggle_grouped_view(self, state):
+        grouped = state == Qt.Checked
+        self.group_tree.setVisible(grouped)
+        self.table.setVisible(not grouped)
+        self.backfill_metrics()
+        self.load_processes()
+
+    def process_exe(self, proc_data):
+        if proc_data.get('exe'):
+            return proc_data['exe']  # Already read by the attribute sampler
+        key = (proc_data['pid'], proc_data['create_time'])
+        if key not in self.exe_cache:
+            self.exe_cache[key] = lookup_exe(proc_data['pid'])
+        return self.exe_cache[key]
+
+    def load_groups(self):
+        full_list = self.filtered_process_list()
+        if self.group_mode_dropdown.currentText() == "By Path":
+            for proc in full_list:
+                proc['exe'] = self.process_exe(proc)
+            live = {(p['pid'], p['create_time']) for p in full_list}
+            self.exe_cache = {key: exe for key, exe in self.exe_cache.items() if key in live}
+            groups = group_processes(full_list, path_key)
+        else:
+            groups = group_processes(full_list, name_key)
+
+        # Sort with checked groups at the top
+        sort_metric = SORT_METRICS.get(self.sort_dropdown.currentText(), 'cpu_percent')
+        if sort_metric not in GROUP_VIEW_METRICS:
+            sort_metric = 'cpu_percent'
+        if self.sort_dropdown.currentText() == "Alphabetical":
+            groups.sort(key=lambda g: (g['key'] not in self.checked_groups, g['key']))
+        else:
+            groups.sort(key=lambda g: (g['key'] not in self.checked_groups, -g[sort_metric]))
+
+        self.group_tree.setUpdatesEnabled(False)
+        self.group_tree.blockSignals(True)
+        self.group_tree.clear()
+        for group in groups:
+            group_item = QtWidgets.QTreeWidgetItem([
+                group['key'],
+                str(group['count']),
+                f"{group['cpu_percent']:.2f}",
+                f"{group['memory_percent']:.2f}",
+                format_rate(group['read_bps']),
+                format_rate(group['write_bps'])
+            ])
+            group_item.setData(0, Qt.UserRole, group['key'])
+            group_item.setData(1, Qt.UserRole, group['pids'])
+            group_item.setData(2, Qt.UserRole, [proc['name'] for proc in group['members']])
+            group_item.setFlags(group_item.flags() | Qt.ItemIsUserCheckable)
+            group_item.setCheckState(0, Qt.Checked if group['key'] in self.checked_groups else Qt.Unchecked)
+
+            for proc in group['members']:
+                member_item = QtWidgets.QTreeWidgetItem([
+                    proc['name'],
+                    f"PID {proc['pid']}",
+                    f"{proc['cpu_percent']:.2f}",
+                    f"{proc['memory_percent']:.2f}",
+                    format_rate(proc['read_bps']),
+                    format_rate(proc['write_bps'])
+                ])
+                member_item.setData(1, Qt.UserRole, [proc['pid']])
+                member_item.setData(2, Qt.UserRole, [proc['name']])
+                group_item.addChild(member_item)
+
+            self.group_tree.addTopLevelItem(group_item)
+            group_item.setExpanded(group['key'] in self.expanded_groups)
+        self.group_tree.blockSignals(False)
+        self.group_tree.setUpdatesEnabled(True)
+
+    def on_group_expanded(self, item):
+        self.expanded_groups.add(item.data(0, Qt.UserRole))
+
+    def on_group_collapsed(self, item):
+        self.expanded_groups.discard(item.data(0, Qt.UserRole))
+
+    def on_group_checked(self, item, column):
+        if column != 0 or item.parent() is not None:
+            return
+        if item.checkState(0) == Qt.Checked:
+            self.checked_groups.add(item.data(0, Qt.UserRole))
+        else:
+            self.checked_groups.discard(item.data(0, Qt.UserRole))
+
+    def checked_processes(self):
+        """(pid, name) of the checked rows, or of every process in the checked groups when grouped."""
+        processes = []
+        if self.group_checkbox.isChecked():
+            for i in range(self.group_tree.topLevelItemCount()):
+                group_item = self.group_tree.topLevelItem(i)
+                if group_item.checkState(0) == Qt.Checked:
+                    processes.extend(zip(group_item.data(1, Qt.UserRole), group_item.data(2, Qt.UserRole)))
+            return processes
+
+        for row in range(self.table.rowCount()):
+            checkbox_item = self.table.item(row, 0)
+            if checkbox_item and checkbox_item.checkState() == Qt.Checked:
+                processes.append((int(self.table.item(row, 1).text()), self.table.item(row, 2).text()))
+        return processes
+
+    def checked_pids(self):
+        return [pid for pid, _name in self.checked_processes()]
+
     def sync_checkbox_states(self, item):
         if item.column() == 0:
             row = item.row()
@@ -451,9 +1163,8 @@ class FPSBoosterApp(QtWidgets.QWidget):
                 pass
 
             # Ensure all rows with the same process_name match the new state
-            for r in range(self.table.rowCount()):
-                if self.table.item(r, 2).text().lower() == process_name:
-                    self.table.item(r, 0).setCheckState(new_state)
+            for r in self.rows_by_name.get(process_name, []):
+                self.table.item(r, 0).setCheckState(new_state)
 
             if new_state == Qt.Checked:
                 self.selected_process_names.add(process_name)
@@ -463,13 +1174,9 @@ class FPSBoosterApp(QtWidgets.QWidget):
             self.table.itemChanged.connect(self.sync_checkbox_states)
 
     def kill_selected(self):
-        killed_count = 0
-        for row in range(self.table.rowCount()):
-            checkbox_item = self.table.item(row, 0)
-            if checkbox_item and checkbox_item.checkState() == Qt.Checked:
-                pid = int(self.table.item(row, 1).text())
-                if safe_kill(pid, parent_window=self):
-                    killed_count += 1
+        # One prompt and one wait for the whole batch (checked rows or whole groups)
+        killed_count = safe_kill_many(self.checked_pids(), parent_window=self)
+        self.count_action("manual", ACTION_KILL, killed_count)
 
         self.load_processes()
         QtWidgets.QMessageBox.information(
@@ -478,39 +1185,98 @@ class FPSBoosterApp(QtWidgets.QWidget):
             f"Killed {killed_count} processes."
         )
 
+    def soft_boost_selected(self):
+        action = BOOST_ACTIONS[self.boost_action_dropdown.currentText()]
+        if action == ACTION_KILL:
+            # Kill is not reversible, fall back to the gentlest soft action
+            action = ACTION_DEMOTE
+
+        # One batch for all checked rows (or whole groups), with the same protections as a kill
+        pids, skipped = filter_soft_boost_targets(self.checked_pids(), parent_window=self)
+        boosted_count = soft_boost(pids, action, self.current_cpu_usage())
+        self.count_action("manual", action, boosted_count)
+        self.update_soft_boost_label()
+        QtWidgets.QMessageBox.information(
+            self,
+            "Soft Boost Selected",
+            f"Soft-boosted {boosted_count} processes.\n"
+            f"Skipped {skipped} protected processes."
+        )
+
+    def set_boost_target(self):
+        selected = self.selected_processes()
+        if not selected:
+            QtWidgets.QMessageBox.information(self, "No Selection",
+                                              "Please select the process to boost.")
+            return
+
+        pid, name = selected[0]
+
+        self.clear_boost_target()
+        if self.target_mode_dropdown.currentText() == "Target by PID":
+            self.target_profile = create_target_profile(pid=pid)
+            self.target_label.setText(f"Boost target: PID {pid}")
+        else:
+            self.target_profile = create_target_profile(name=name)
+            self.target_label.setText(f"Boost target: {self.target_profile['name']}")
+
+        apply_target_profile(self.target_profile, self.process_map, self.is_protected_from_target)
+
+    def clear_boost_target(self):
+        if self.target_profile is None:
+            return
+        revert_target_profile(self.target_profile)
+        self.target_profile = None
+        self.target_label.setText("No boost target")
+
+    @staticmethod
+    def is_protected_from_target(name, pid):
+        # Pass the pid so path and sha256: whitelist entries protect too
+        return whitelist_matcher().match(pid, name)
+
+    def update_target_profile(self):
+        """Reapply the target profile to new processes, or revert it once the target exits."""
+        if self.target_profile is None:
+            return
+        if not target_running(self.target_profile, self.process_map):
+            self.clear_boost_target()
+            return
+        apply_target_profile(self.target_profile, self.process_map, self.is_protected_from_target)
+
     ############################################################
     # 5) Whitelist/Blacklist Management
     ############################################################
     def add_selected_to_whitelist(self):
         whitelist = load_json_file(USER_WHITELIST_FILE, "user_defined_whitelist")
 
-        for row in range(self.table.rowCount()):
-            checkbox_item = self.table.item(row, 0)
-            if checkbox_item and checkbox_item.checkState() == Qt.Checked:
-                process_name = self.table.item(row, 2).text().split()[0]
-                if process_name not in whitelist:
-                    whitelist.append(process_name)
+        existing = {normalize_name(entry) for entry in whitelist}
+        for _pid, name in self.checked_processes():
+            process_name = normalize_name(name)
+            if process_name not in existing:
+                whitelist.append(process_name)
+                existing.add(process_name)
 
         save_json_file(USER_WHITELIST_FILE, "user_defined_whitelist", whitelist)
+        self.refresh_watchdog_lists()
         QtWidgets.QMessageBox.information(self, "Whitelist", "Selected processes have been added to the Whitelist.")
         self.load_processes()
 
     def remove_from_whitelist(self):
         # If triggered from the advanced tab
         if self.sender() == self.remove_whitelist_btn2:
-            selected_rows = self.table.selectionModel().selectedRows()
-            if not selected_rows:
+            selected = self.selected_processes()
+            if not selected:
                 QtWidgets.QMessageBox.information(self, "No Selection",
                                                   "Please select a process to remove from the Whitelist.")
                 return
 
             whitelist = load_json_file(USER_WHITELIST_FILE, "user_defined_whitelist")
-            for row in selected_rows:
-                process_name = self.table.item(row.row(), 2).text().split()[0]
-                if process_name in whitelist:
-                    whitelist.remove(process_name)
+            # Entries are matched case-insensitively, so remove every spelling of the name
+            selected_names = {normalize_name(name) for _pid, name in selected}
+            whitelist = [entry for entry in whitelist if normalize_name(entry) not in selected_names]
 
             save_json_file(USER_WHITELIST_FILE, "user_defined_whitelist", whitelist)
+            self.refresh_watchdog_lists()
             QtWidgets.QMessageBox.information(self, "Removed", "Selected process(es) removed from the Whitelist.")
             self.load_processes()
         else:
@@ -528,39 +1294,41 @@ class FPSBoosterApp(QtWidgets.QWidget):
                     whitelist.remove(process_name)
 
             save_json_file(USER_WHITELIST_FILE, "user_defined_whitelist", whitelist)
+            self.refresh_watchdog_lists()
             QtWidgets.QMessageBox.information(self, "Removed", "Selected process(es) removed from the Whitelist.")
             self.load_manage_lists()
 
     def add_selected_to_blacklist(self):
         blacklist = load_json_file(USER_BLACKLIST_FILE, "user_defined_blacklist")
 
-        for row in range(self.table.rowCount()):
-            checkbox_item = self.table.item(row, 0)
-            if checkbox_item and checkbox_item.checkState() == Qt.Checked:
-                process_name = self.table.item(row, 2).text().split()[0]
-                if process_name not in blacklist:
-                    blacklist.append(process_name)
+        existing = {normalize_name(entry) for entry in blacklist}
+        for _pid, name in self.checked_processes():
+            process_name = normalize_name(name)
+            if process_name not in existing:
+                blacklist.append(process_name)
+                existing.add(process_name)
 
         save_json_file(USER_BLACKLIST_FILE, "user_defined_blacklist", blacklist)
+        self.refresh_watchdog_lists()
         QtWidgets.QMessageBox.information(self, "Blacklist", "Selected processes have been added to the Blacklist.")
         self.load_processes()
 
     def remove_from_blacklist(self):
         # If triggered from the advanced tab
         if self.sender() == self.remove_blacklist_btn2:
-            selected_rows = self.table.selectionModel().selectedRows()
-            if not selected_rows:
+            selected = self.selected_processes()
+            if not selected:
                 QtWidgets.QMessageBox.information(self, "No Selection",
                                                   "Please select a process to remove from the Blacklist.")
                 return
 
             blacklist = load_json_file(USER_BLACKLIST_FILE, "user_defined_blacklist")
-            for row in selected_rows:
-                process_name = self.table.item(row.row(), 2).text().split()[0]
-                if process_name in blacklist:
-                    blacklist.remove(process_name)
+            # Entries are matched case-insensitively, so remove every spelling of the name
+            selected_names = {normalize_name(name) for _pid, name in selected}
+            blacklist = [entry for entry in blacklist if normalize_name(entry) not in selected_names]
 
             save_json_file(USER_BLACKLIST_FILE, "user_defined_blacklist", blacklist)
+            self.refresh_watchdog_lists()
             QtWidgets.QMessageBox.information(self, "Removed", "Selected process(es) removed from the Blacklist.")
             self.load_processes()
         else:
@@ -578,6 +1346,7 @@ class FPSBoosterApp(QtWidgets.QWidget):
                     blacklist.remove(process_name)
 
             save_json_file(USER_BLACKLIST_FILE, "user_defined_blacklist", blacklist)
+            self.refresh_watchdog_lists()
             QtWidgets.QMessageBox.information(self, "Removed", "Selected process(es) removed from the Blacklist.")
             self.load_manage_lists()
 
@@ -598,14 +1367,31 @@ class FPSBoosterApp(QtWidgets.QWidget):
         self.timer.start(3000)  # 3 seconds
 
     def refresh_all_tables(self):
+        start = time.perf_counter()
         self.update_process_map()
-        self.load_basic_table()
-        self.load_processes()
+        self.prune_rule_caches()
+        self.leak_detector.update(self.rolling_usage)
+        self.update_target_profile()
+        self.load_visible_table()
+        self.update_soft_boost_label()
+        self.update_enforcement_label()
+        self.refresh_seconds = time.perf_counter() - start
+        self.publish_metrics()
+
+    def prune_rule_caches(self):
+        """Drop cached list rule results of processes that are no longer in the full snapshot."""
+        live_keys = {(pid, usage["create_time"]) for pid, usage in self.rolling_usage.items()}
+        whitelist_matcher().prune(live_keys)
+        blacklist_matcher().prune(live_keys)
 
     ############################################################
     # 7) Maintaining psutil.Process Objects + Rolling Averages
     ############################################################
     def update_process_map(self):
+        if self.replay is not None:
+            self.replay.apply(self.rolling_usage, self.history_size)
+            return
+
         # 1) Remove ended processes
         dead_pids = []
         for pid, proc in self.process_map.items():
@@ -633,24 +1419,30 @@ class FPSBoosterApp(QtWidgets.QWidget):
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
 
-        # 3) Update rolling averages
-        for pid, proc in self.process_map.items():
-            try:
-                raw_cpu = proc.cpu_percent(interval=None)
-                scaled_cpu = raw_cpu / self.num_cores
-                mem_usage = proc.memory_percent()
-
-                if pid not in self.rolling_usage:
-                    self.rolling_usage[pid] = {
-                        "cpu_history": deque(maxlen=self.history_size),
-                        "mem_history": deque(maxlen=self.history_size)
-                    }
-
-                self.rolling_usage[pid]["cpu_history"].append(scaled_cpu)
-                self.rolling_usage[pid]["mem_history"].append(mem_usage)
-
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
+        # 3) Update rolling averages (only the metrics the current view needs)
+        metrics = self.required_metrics()
+        self.sampler.sample(self.process_map, self.rolling_usage, metrics)
+        self.collection_cost = collection_cost(metrics) * len(self.process_map)
+
+        # 4) Refresh some of the expensive attributes, busiest and stalest first
+        self.sample_attributes(metrics)
+
+        if self.recorder is not None:
+            self.recorder.record(latest_values(self.rolling_usage))
+
+    def closeEvent(self, event):
+        self.close_thread_pane()
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        # Never leave other processes pinned off the target's cores
+        self.clear_boost_target()
+        if self.exporter is not None:
+            self.exporter.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.replay is not None:
+            self.replay.close()
+        super().closeEvent(event)
 
 ############################################################
 # 8) LOAD STYLE SHEET & ENTRY POINT
@@ -660,7 +1452,7 @@ def load_stylesheet(app, stylesheet_path="style.qss"):
         style = f.read()
     app.setStyleSheet(style)
 
-def run_app():
+def run_app(replay_path=None):
     app = QtWidgets.QApplication(sys.argv)
 
     # Optional: Use a built-in style first, then apply QSS
@@ -668,6 +1460,15 @@ def run_app():
 
     load_stylesheet(app, STYLES_PATH)  # Update path if needed
 
-    window = FPSBoosterApp()
+    replay = None
+    if replay_path:
+        try:
+            replay = TraceReplaySource(replay_path)
+        except (OSError, ValueError) as e:
+            # The console is hidden, so this is the only place the error can be seen
+            QtWidgets.QMessageBox.critical(None, "Replay", f"Could not open the trace:\n{e}")
+            sys.exit(1)
+
+    window = FPSBoosterApp(replay)
     window.show()
     sys.exit(app.exec_())
@@ -0,0 +1,153 @@
+import math
+import os
+import time
+from array import array
+
+import psutil
+
+from src.utils import load_json_file
+
+# Vectorized trend fitting (optional)
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEAK_DETECTOR_FILE = os.path.join(BASE_DIR, "config", "leak_detector.json")
+
+DEFAULT_SETTINGS = {
+    "interval_seconds": 60,
+    "window_samples": 120,
+    "min_samples": 10,
+    "min_growth_mb_per_hour": 50.0,
+    "min_r2": 0.8
+}
+
+
+def load_leak_settings():
+    """Load the leak detector thresholds, falling back to the defaults."""
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(load_json_file(LEAK_DETECTOR_FILE, "leak_detector") or {})
+    return settings
+
+
+def fit_trends_numpy(times, rows):
+    """Least-squares slope and R² of every row against times, in one vectorized pass."""
+    x = np.array(times)
+    y = np.array(rows)
+    mask = ~np.isnan(y) & ~np.isnan(x)
+    x = np.where(mask, x - np.nanmin(x), 0.0)
+    y = np.where(mask, y, 0.0)
+
+    n = mask.sum(axis=1)
+    sx, sy = x.sum(axis=1), y.sum(axis=1)
+    sxx, syy, sxy = (x * x).sum(axis=1), (y * y).sum(axis=1), (x * y).sum(axis=1)
+
+    cov = n * sxy - sx * sy
+    var_x = n * sxx - sx * sx
+    var_y = n * syy - sy * sy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(var_x > 0, cov / var_x, 0.0)
+        r2 = np.where((var_x > 0) & (var_y > 0), cov * cov / (var_x * var_y), 0.0)
+    return list(zip(slope.tolist(), r2.tolist(), n.tolist()))
+
+
+def fit_trends_python(times, rows):
+    """Pure Python fallback of fit_trends_numpy."""
+    valid_times = [t for t in times if not math.isnan(t)]
+    origin = min(valid_times) if valid_times else 0.0
+
+    results = []
+    for row in rows:
+        n = sx = sy = sxx = syy = sxy = 0.0
+        for t, y in zip(times, row):
+            if math.isnan(t) or math.isnan(y):
+                continue
+            x = t - origin
+            n += 1
+            sx += x
+            sy += y
+            sxx += x * x
+            syy += y * y
+            sxy += x * y
+        cov = n * sxy - sx * sy
+        var_x = n * sxx - sx * sx
+        var_y = n * syy - sy * sy
+        slope = cov / var_x if var_x > 0 else 0.0
+        r2 = cov * cov / (var_x * var_y) if var_x > 0 and var_y > 0 else 0.0
+        results.append((slope, r2, int(n)))
+    return results
+
+
+class LeakDetector:
+    """
+    Flags processes whose memory keeps growing.
+    Memory is downsampled to one sample per interval into fixed-size ring buffers that share
+    one time column, and the growth slope and R² of every process are fitted together after
+    each sample. Memory use is bounded by window_samples per process.
+    """
+
+    def __init__(self, settings=None):
+        settings = settings or load_leak_settings()
+        self.interval = settings["interval_seconds"]
+        self.capacity = settings["window_samples"]
+        self.min_samples = settings["min_samples"]
+        self.min_growth = settings["min_growth_mb_per_hour"] * 1024 * 1024
+        self.min_r2 = settings["min_r2"]
+        self.total_memory = psutil.virtual_memory().total
+
+        self.times = array('d', [math.nan] * self.capacity)
+        self.position = 0
+        self.last_sample = None
+        self.history = {}  # (pid, create_time) -> array of RSS bytes, aligned with self.times
+        self.results = {}  # pid -> (growth bytes/hour, r2, leaking)
+
+    def update(self, rolling_usage, now=None):
+        """Take a downsampled memory reading if the interval has passed. Returns True if it did."""
+        now = time.time() if now is None else now
+        if self.last_sample is not None and now - self.last_sample < self.interval:
+            return False
+        self.last_sample = now
+
+        position = self.position
+        self.times[position] = now
+        self.position = (position + 1) % self.capacity
+
+        live = {}
+        for pid, usage in rolling_usage.items():
+            if not usage["mem_history"]:
+                continue
+            key = (pid, usage["create_time"])
+            live[key] = pid
+            if key not in self.history:
+                self.history[key] = array('d', [math.nan] * self.capacity)
+            self.history[key][position] = usage["mem_history"][-1] / 100 * self.total_memory
+
+        # Processes that are gone (or were not sampled) this round are dropped
+        for key in list(self.history):
+            if key not in live:
+                del self.history[key]
+
+        self.fit(live)
+        return True
+
+    def fit(self, live):
+        keys = list(self.history)
+        if not keys:
+            self.results = {}
+            return
+        rows = [self.history[key] for key in keys]
+        fit_trends = fit_trends_numpy if HAS_NUMPY else fit_trends_python
+
+        results = {}
+        for key, (slope, r2, n) in zip(keys, fit_trends(self.times, rows)):
+            growth = slope * 3600  # bytes/second -> bytes/hour
+            leaking = n >= self.min_samples and growth >= self.min_growth and r2 >= self.min_r2
+            results[live[key]] = (growth, r2, leaking)
+        self.results = results
+
+    def result(self, pid):
+        """Return (growth bytes/hour, r2, leaking) for a PID."""
+        return self.results.get(pid, (0.0, 0.0, False))
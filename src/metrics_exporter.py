@@ -0,0 +1,148 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.grouping import group_processes, name_key
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9877
+
+# Per-process gauges: metric key -> (exported name, help text)
+PROCESS_GAUGES = {
+    'cpu_percent': ("fpsbooster_process_cpu_percent", "Rolling average CPU usage in percent of all cores."),
+    'memory_percent': ("fpsbooster_process_memory_percent", "Rolling average memory usage in percent."),
+    'read_bps': ("fpsbooster_process_read_bytes_per_second", "Disk read rate."),
+    'write_bps': ("fpsbooster_process_write_bytes_per_second", "Disk write rate."),
+    'ctx_switches_ps': ("fpsbooster_process_context_switches_per_second", "Context switch rate.")
+}
+
+
+def escape_label(value):
+    """Escape a label value for the text exposition format."""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def bucket_processes(process_list, top_n):
+    """
+    Sum processes by name, keep the top_n names by CPU and fold the rest into a single
+    "other" row. Labels carry only the name, so the set of series stays bounded by the
+    applications seen rather than growing with every new PID.
+    """
+    groups = group_processes(process_list, name_key, tuple(PROCESS_GAUGES))
+    groups.sort(key=lambda g: g['cpu_percent'], reverse=True)
+    rows = [(g['key'], g) for g in groups[:top_n]]
+
+    rest = groups[top_n:]
+    if rest:
+        other = {metric: sum(g[metric] for g in rest) for metric in PROCESS_GAUGES}
+        rows.append(("other", other))
+    return rows
+
+
+def render_metrics(process_list, stats, top_n):
+    """Render a snapshot and the app counters in Prometheus text exposition format."""
+    lines = []
+    rows = bucket_processes(process_list, top_n)
+
+    for metric, (exported, help_text) in PROCESS_GAUGES.items():
+        lines.append(f"# HELP {exported} {help_text}")
+        lines.append(f"# TYPE {exported} gauge")
+        for name, values in rows:
+            lines.append(f'{exported}{{name="{escape_label(name)}"}} {values.get(metric, 0.0)}')
+
+    lines.append("# HELP fpsbooster_processes Number of sampled processes.")
+    lines.append("# TYPE fpsbooster_processes gauge")
+    lines.append(f"fpsbooster_processes {len(process_list)}")
+
+    for metric, (exported, help_text) in PROCESS_GAUGES.items():
+        total_name = exported.replace("fpsbooster_process_", "fpsbooster_total_")
+        lines.append(f"# HELP {total_name} Sum over all processes. {help_text}")
+        lines.append(f"# TYPE {total_name} gauge")
+        lines.append(f"{total_name} {sum(p.get(metric, 0.0) for p in process_list)}")
+
+    lines.append("# HELP fpsbooster_actions_total Boost actions taken since start.")
+    lines.append("# TYPE fpsbooster_actions_total counter")
+    for (source, action), count in sorted(stats.get("actions", {}).items()):
+        lines.append(f'fpsbooster_actions_total{{source="{escape_label(source)}",action="{escape_label(action)}"}} {count}')
+
+    lines.append("# HELP fpsbooster_refresh_duration_seconds Duration of the last full refresh.")
+    lines.append("# TYPE fpsbooster_refresh_duration_seconds gauge")
+    lines.append(f"fpsbooster_refresh_duration_seconds {stats.get('refresh_seconds', 0.0)}")
+
+    lines.append("# HELP fpsbooster_collection_cost Declared sampling cost of the last refresh "
+                 "(provider cost of the collected metrics times the number of processes).")
+    lines.append("# TYPE fpsbooster_collection_cost gauge")
+    lines.append(f"fpsbooster_collection_cost {stats.get('collection_cost', 0)}")
+
+    lines.append("# HELP fpsbooster_snapshot_timestamp_seconds Unix time of the published snapshot.")
+    lines.append("# TYPE fpsbooster_snapshot_timestamp_seconds gauge")
+    lines.append(f"fpsbooster_snapshot_timestamp_seconds {stats.get('timestamp', 0.0)}")
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """
+    Optional localhost HTTP endpoint serving the latest snapshot at /metrics.
+    The app publishes a snapshot after each refresh; the payload is rendered on the first
+    scrape after that and cached, so scrapes never trigger sampling.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, top_n=20):
+        self.host = host
+        self.port = port
+        self.top_n = top_n
+        self.server = None
+        self.thread = None
+
+        self._lock = threading.Lock()
+        self._process_list = []
+        self._stats = {}
+        self._payload = None
+
+    def publish(self, process_list, stats):
+        """Store a new snapshot; rendering is deferred until it is scraped."""
+        stats = dict(stats, timestamp=time.time())
+        with self._lock:
+            self._process_list = process_list
+            self._stats = stats
+            self._payload = None
+
+    def payload(self):
+        """Return the rendered payload of the current snapshot."""
+        with self._lock:
+            if self._payload is None:
+                self._payload = render_metrics(self._process_list, self._stats, self.top_n).encode("utf-8")
+            return self._payload
+
+    def start(self):
+        """Start serving in a background thread. Raises OSError if the port is taken."""
+        exporter = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.payload()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep scrapes out of the console
+
+        self.server = ThreadingHTTPServer((self.host, self.port), MetricsHandler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.server is None:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+        self.thread = None
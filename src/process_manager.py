@@ -10,15 +10,9 @@ PROCESS_WHITELIST = os.path.join(BASE_DIR, "config", "process_whitelist.json")
 USER_WHITELIST = os.path.join(BASE_DIR, "config", "user_whitelist.json")
 USER_BLACKLIST = os.path.join(BASE_DIR, "config", "user_blacklist.json")
 
-
-# GPU monitoring (optional)
-try:
-    import GPUtil
-    HAS_GPU = True
-except ImportError:
-    HAS_GPU = False
-
 from src.utils import log_kill_action, load_json_file
+from src.rule_matcher import load_list_matcher
+from src.sampler import MetricSampler, METRIC_HISTORIES, attribute_value, is_system_process
 from PyQt5.QtWidgets import QMessageBox
 
 # Load system-level whitelist
@@ -31,27 +25,25 @@ def load_user_whitelist():
 def load_user_blacklist():
     return load_json_file(USER_BLACKLIST, "user_defined_blacklist")
 
-def is_system_process(proc):
-    """Check if a process is a system-level process."""
-    try:
-        is_system_user = proc.username() in ["SYSTEM", "Local Service", "Network Service"]
-        is_system_path = "c:\\windows\\system32" in proc.exe().lower()
-        return is_system_user or is_system_path
-    except (psutil.NoSuchProcess, psutil.AccessDenied):
-        return False
+def whitelist_matcher():
+    """Compiled matcher for the system + user-defined whitelist."""
+    return load_list_matcher(USER_WHITELIST, "user_defined_whitelist", SYSTEM_WHITELIST)
+
+def blacklist_matcher():
+    """Compiled matcher for the user-defined blacklist."""
+    return load_list_matcher(USER_BLACKLIST, "user_defined_blacklist")
 
-def is_process_whitelisted(process_name):
-    """Check if process is in system or user-defined whitelist."""
-    process_name_lower = process_name.lower()
-    user_whitelist = [p.lower() for p in load_user_whitelist()]
-    # Combine system + user whitelist
-    combined_whitelist = [p.lower() for p in SYSTEM_WHITELIST] + user_whitelist
-    return process_name_lower in combined_whitelist
+def is_process_whitelisted(process_name, pid=None):
+    """Check if process is in system or user-defined whitelist (path/hash rules need the pid)."""
+    if pid is None:
+        return whitelist_matcher().match_name(process_name)
+    return whitelist_matcher().match(pid, process_name)
 
-def is_process_blacklisted(process_name):
-    """Check if process is in user-defined blacklist."""
-    user_blacklist = [p.lower() for p in load_user_blacklist()]
-    return process_name.lower() in user_blacklist
+def is_process_blacklisted(process_name, pid=None):
+    """Check if process is in user-defined blacklist (path/hash rules need the pid)."""
+    if pid is None:
+        return blacklist_matcher().match_name(process_name)
+    return blacklist_matcher().match(pid, process_name)
 
 
 def force_kill(pid):
@@ -132,43 +124,129 @@ def safe_kill(pid, force=False, parent_window=None):
     except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
         return False
 
-def list_processes():
-    """Return a list of processes with CPU, Memory, GPU usage (if available)."""
-    # Prime CPU usage to get immediate stats
-    for proc in psutil.process_iter():
+def filter_soft_boost_targets(pids, parent_window=None):
+    """
+    Apply the safe_kill protections before a soft action.
+    Whitelisted processes and MpDefenderCoreService.exe are always skipped, system processes
+    need one confirmation for the whole batch. Returns (allowed pids, skipped count).
+    """
+    matcher = whitelist_matcher()
+    allowed = []
+    system = []
+    skipped = 0
+    for pid in pids:
         try:
-            proc.cpu_percent(interval=None)
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            process = psutil.Process(pid)
+            process_name = process.name()
+            if (process_name.lower() == "mpdefendercoreservice.exe"
+                    or matcher.match(pid, process_name, process.create_time())):
+                skipped += 1
+            elif is_system_process(process):
+                system.append((pid, process_name))
+            else:
+                allowed.append(pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
             continue
 
+    if system:
+        if confirm_system_processes(system, "Changing", parent_window):
+            allowed.extend(pid for pid, _process_name in system)
+        else:
+            skipped += len(system)
+    return allowed, skipped
+
+def confirm_system_processes(system, verb, parent_window=None):
+    """Ask once whether a batch of (pid, name) system processes may be affected."""
+    names = ", ".join(sorted({process_name for _pid, process_name in system}))
+    response = QtWidgets.QMessageBox.warning(
+        parent_window,
+        "System Process Warning",
+        f"{len(system)} system process(es) would be affected: {names}\n"
+        f"{verb} them may cause system instability.\n\n"
+        "Do you really want to continue?",
+        QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+        QtWidgets.QMessageBox.No
+    )
+    return response == QtWidgets.QMessageBox.Yes
+
+def safe_kill_many(pids, force=False, parent_window=None):
+    """
+    Batch version of safe_kill.
+    System processes are confirmed with a single prompt, every process is asked to terminate
+    first and all of them are waited for together, so the UI blocks at most once for the
+    timeout. Returns the number of processes that ended.
+    """
     processes = []
-    for proc in psutil.process_iter(['pid', 'name']):
+    system = []
+    defender_skipped = False
+    for pid in pids:
+        try:
+            process = psutil.Process(pid)
+            process_name = process.name()
+            if process_name.lower() == "mpdefendercoreservice.exe":
+                defender_skipped = True
+            elif is_system_process(process):
+                system.append((pid, process_name))
+                processes.append(process)
+            else:
+                processes.append(process)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+
+    if defender_skipped:
+        QtWidgets.QMessageBox.information(
+            parent_window,
+            "Warning",
+            "MpDefenderCoreService.exe was skipped. It is a vital anti-virus process built into Windows.\n"
+            "To stop this process, disable Windows Defender via settings. (NOT RECOMMENDED)",
+            QtWidgets.QMessageBox.Ok
+        )
+
+    if system and not confirm_system_processes(system, "Terminating", parent_window):
+        system_pids = {pid for pid, _process_name in system}
+        processes = [process for process in processes if process.pid not in system_pids]
+
+    terminated = []
+    for process in processes:
         try:
-            cpu_usage = proc.cpu_percent(interval=None)
-            mem_usage = proc.memory_percent()
-            name = proc.name()
-            pid = proc.pid
-
-            # Mark if it's a system process
-            if is_system_process(proc):
-                name += " (SYSTEM)"
-
-            # GPU usage: If we have the GPUtil library, try to get the usage for the matching PID
-            gpu_usage = 0.0
-            if HAS_GPU:
-                for gpu_proc in GPUtil.getGPUs():
-                    for p in gpu_proc.processes:
-                        if p['pid'] == pid:
-                            gpu_usage = p['gpu_util']
-                            break
-
-            processes.append({
-                'pid': pid,
-                'name': name,
-                'cpu_percent': cpu_usage,
-                'memory_percent': mem_usage,
-                'gpu_percent': gpu_usage
-            })
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            process.terminate()
+            terminated.append(process)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
             continue
+
+    gone, alive = psutil.wait_procs(terminated, timeout=3)
+    killed = len(gone)
+    if force:
+        for process in alive:
+            # Force kill if graceful termination failed
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], shell=True)
+            killed += 1
+    return killed
+
+def list_processes(metrics=('cpu_percent', 'memory_percent', 'gpu_percent', 'is_system')):
+    """Return a list of processes with the requested metrics (CPU, Memory, GPU usage by default)."""
+    process_map = {}
+    for proc in psutil.process_iter():
+        process_map[proc.pid] = proc
+
+    # Prime CPU usage to get immediate stats, then collect only what was asked for
+    sampler = MetricSampler(history_size=1)
+    rolling_usage = {}
+    sampler.sample(process_map, rolling_usage, {'cpu_percent'})
+    sampler.sample(process_map, rolling_usage, set(metrics) | {'cpu_percent'})
+    sampler.sample_attributes(process_map, rolling_usage, metrics, budget=None)
+
+    processes = []
+    for pid, usage in rolling_usage.items():
+        name = usage["name"]
+        # Mark if it's a system process
+        if attribute_value(usage, 'is_system')[0]:
+            name += " (SYSTEM)"
+
+        proc_data = {'pid': pid, 'name': name}
+        for metric in metrics:
+            if metric in METRIC_HISTORIES:
+                history = usage[METRIC_HISTORIES[metric]]
+                proc_data[metric] = history[-1] if history else 0.0
+        processes.append(proc_data)
     return processes
@@ -0,0 +1,247 @@
+import fnmatch
+import hashlib
+import os
+import re
+
+import psutil
+
+from src.utils import load_json_file
+
+# Entry prefixes
+REGEX_PREFIX = "re:"
+HASH_PREFIX = "sha256:"
+GLOB_CHARS = "*?["
+
+# Compiled list matchers: filepath -> (file version, extra entries, matcher)
+_matcher_cache = {}
+
+# File digests: (path, mtime, size) -> sha256 hex digest
+_digest_cache = {}
+
+
+def normalize_name(name):
+    """Lowercase a process name and drop the " (SYSTEM)" display suffix."""
+    name = name.lower()
+    if name.endswith(" (system)"):
+        name = name[:-len(" (system)")]
+    return name
+
+
+def normalize_path(path):
+    """Lowercase a path and use "/" as the only separator."""
+    return path.lower().replace("\\", "/").rstrip("/")
+
+
+def file_digest(path):
+    """Return the sha256 hex digest of a file, cached until the file changes."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_mtime, stat.st_size)
+    if key not in _digest_cache:
+        sha256 = hashlib.sha256()
+        try:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    sha256.update(chunk)
+        except OSError:
+            return None
+        _digest_cache[key] = sha256.hexdigest()
+    return _digest_cache[key]
+
+
+def entry_error(entry):
+    """Return why a list entry cannot be used, or None if it is valid."""
+    entry = entry.strip()
+    lower = entry.lower()
+    if lower.startswith(REGEX_PREFIX):
+        try:
+            re.compile(entry[len(REGEX_PREFIX):])
+        except re.error as e:
+            return f"Invalid regular expression: {e}"
+    elif lower.startswith(HASH_PREFIX):
+        if re.fullmatch(r"[0-9a-f]{64}", lower[len(HASH_PREFIX):]) is None:
+            return "A sha256: entry needs the 64 hex digit digest of the executable"
+    return None
+
+
+def lookup_exe(pid):
+    """Return the executable path of a PID, or "" if it cannot be read."""
+    try:
+        return psutil.Process(pid).exe()
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return ""
+
+
+class RuleMatcher:
+    """
+    All whitelist/blacklist entries compiled into one matcher.
+
+    Entry syntax:
+        name.exe              exact process name (case-insensitive)
+        *updater*.exe         glob on the process name
+        re:^office.*\\.exe$    regular expression on the process name
+        C:\\Program Files\\Foo  executable path prefix (globs allowed)
+        sha256:<hex digest>   hash of the executable file
+
+    Exact names and digests are set lookups, path prefixes walk a trie of path segments and
+    name patterns share one combined regex. Patterns that cannot be combined safely (groups,
+    backreferences, global inline flags) are compiled on their own. Results are cached per (pid, create_time),
+    so a process is only evaluated once in its lifetime.
+    """
+
+    def __init__(self, entries):
+        self.names = set()
+        self.digests = set()
+        self.path_trie = {}
+        self.invalid = []
+
+        name_patterns = []
+        path_patterns = []
+        for entry in entries:
+            entry = entry.strip()
+            lower = entry.lower()
+            if not entry:
+                continue
+            if entry_error(entry):
+                self.invalid.append(entry)
+                continue
+            if lower.startswith(REGEX_PREFIX):
+                name_patterns.append(entry[len(REGEX_PREFIX):])
+            elif lower.startswith(HASH_PREFIX):
+                self.digests.add(lower[len(HASH_PREFIX):])
+            elif "/" in entry or "\\" in entry:
+                path = normalize_path(entry)
+                if any(c in path for c in GLOB_CHARS):
+                    path_patterns.append(fnmatch.translate(path))
+                else:
+                    self.add_path_prefix(path)
+            elif any(c in entry for c in GLOB_CHARS):
+                name_patterns.append(fnmatch.translate(lower))
+            else:
+                self.names.add(normalize_name(entry))
+
+        self.name_regexes = self.compile_patterns(name_patterns)
+        self.path_regexes = self.compile_patterns(path_patterns)
+        self.needs_exe = bool(self.path_trie or self.path_regexes or self.digests)
+        self.cache = {}
+
+    def compile_patterns(self, patterns):
+        """
+        Compile patterns into a list of regexes: one alternation of every pattern that can be
+        combined, plus the rest on their own. Never raises; unusable patterns go to invalid.
+        """
+        combinable = []
+        separate = []
+        for pattern in patterns:
+            try:
+                compiled = re.compile(pattern, re.IGNORECASE)
+            except re.error:
+                self.invalid.append(pattern)
+                continue
+            # Groups would be renumbered or clash by name, and global flags must come first
+            try:
+                re.compile(f"(?:{pattern})")
+                wrappable = True
+            except re.error:
+                wrappable = False
+            if compiled.groups or not wrappable:
+                separate.append(compiled)
+            else:
+                combinable.append(pattern)
+
+        regexes = []
+        if combinable:
+            try:
+                regexes.append(re.compile("|".join(f"(?:{p})" for p in combinable), re.IGNORECASE))
+            except re.error:
+                regexes.extend(re.compile(p, re.IGNORECASE) for p in combinable)
+        return regexes + separate
+
+    def add_path_prefix(self, path):
+        node = self.path_trie
+        for segment in path.split("/"):
+            node = node.setdefault(segment, {})
+        node[None] = True  # End of a prefix
+
+    def match_name(self, name):
+        name = normalize_name(name)
+        if name in self.names:
+            return True
+        return any(regex.fullmatch(name) is not None for regex in self.name_regexes)
+
+    def match_path(self, exe):
+        if not exe:
+            return False
+        path = normalize_path(exe)
+        node = self.path_trie
+        for segment in path.split("/"):
+            node = node.get(segment)
+            if node is None:
+                break
+            if None in node:
+                return True
+        return any(regex.fullmatch(path) is not None for regex in self.path_regexes)
+
+    def match_digest(self, exe):
+        if not self.digests or not exe:
+            return False
+        return file_digest(exe) in self.digests
+
+    def match(self, pid, name, create_time=None, exe=None):
+        """Check a single process. exe is looked up only when path or hash rules exist."""
+        key = (pid, create_time)
+        if create_time is not None and key in self.cache:
+            return self.cache[key]
+
+        result = self.match_name(name)
+        if not result and self.needs_exe:
+            if exe is None:
+                exe = lookup_exe(pid)
+            result = self.match_path(exe) or self.match_digest(exe)
+
+        if create_time is not None:
+            self.cache[key] = result
+        return result
+
+    def match_snapshot(self, process_list):
+        """
+        Evaluate every rule against a full snapshot in one pass.
+        process_list holds dicts with 'pid', 'name' and optionally 'create_time' and 'exe'.
+        Returns the set of matching PIDs.
+        """
+        matched = set()
+        for proc in process_list:
+            if self.match(proc['pid'], proc['name'], proc.get('create_time'), proc.get('exe')):
+                matched.add(proc['pid'])
+        return matched
+
+    def prune(self, live_keys):
+        """
+        Forget processes that are gone so the cache stays bounded.
+        live_keys must cover the full snapshot as (pid, create_time), not a filtered view.
+        """
+        # Rebuilt from a copy, the enforcement watchdog may match from its own thread meanwhile
+        self.cache = {key: result for key, result in list(self.cache.items()) if key in live_keys}
+
+
+def load_list_matcher(filepath, key, extra_entries=()):
+    """
+    Return the compiled matcher for a list file.
+    The matcher is rebuilt only when the file (or extra_entries) changes.
+    """
+    try:
+        stat = os.stat(filepath)
+        version = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        version = None
+    extra_entries = tuple(extra_entries)
+
+    cached = _matcher_cache.get(filepath)
+    if cached and cached[0] == version and cached[1] == extra_entries:
+        return cached[2]
+
+    matcher = RuleMatcher(list(extra_entries) + load_json_file(filepath, key))
+    _matcher_cache[filepath] = (version, extra_entries, matcher)
+    return matcher
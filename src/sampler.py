@@ -0,0 +1,344 @@
+import math
+import time
+from collections import deque
+
+import psutil
+
+# GPU monitoring (optional)
+try:
+    import GPUtil
+    HAS_GPU = True
+except ImportError:
+    HAS_GPU = False
+
+# Rolling metric key -> history deque key
+METRIC_HISTORIES = {
+    'cpu_percent': "cpu_history",
+    'memory_percent': "mem_history",
+    'read_bps': "read_history",
+    'write_bps': "write_history",
+    'ctx_switches_ps': "ctx_history",
+    'gpu_percent': "gpu_history"
+}
+
+
+def is_system_process(proc):
+    """Check if a process is a system-level process."""
+    try:
+        is_system_user = proc.username() in ["SYSTEM", "Local Service", "Network Service"]
+        is_system_path = "c:\\windows\\system32" in proc.exe().lower()
+        return is_system_user or is_system_path
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return False
+
+
+############################################################
+# Metric providers
+# prepare(tick) runs once per sampling pass, collect(proc, usage, tick)
+# runs once per process inside proc.oneshot().
+############################################################
+def collect_cpu(proc, usage, tick):
+    usage["cpu_history"].append(proc.cpu_percent(interval=None) / tick["num_cores"])
+
+
+def prepare_memory(tick):
+    # Read total memory once per pass instead of once per process (memory_percent() does)
+    tick["total_memory"] = psutil.virtual_memory().total
+
+
+def collect_memory(proc, usage, tick):
+    usage["mem_history"].append(proc.memory_info().rss / tick["total_memory"] * 100)
+
+
+def append_rate(usage, history, counter_key, current, now):
+    """Append the per-second delta of a cumulative counter since the previous pass."""
+    previous = usage["counters"].get(counter_key)
+    usage["counters"][counter_key] = (now, current)
+    if current is None or previous is None or previous[1] is None or now <= previous[0]:
+        return
+    usage[history].append(max(0, current - previous[1]) / (now - previous[0]))
+
+
+def collect_disk_io(proc, usage, tick):
+    try:
+        io = proc.io_counters()
+        read_bytes, write_bytes = io.read_bytes, io.write_bytes
+    except (AttributeError, psutil.AccessDenied):
+        read_bytes = write_bytes = None
+    append_rate(usage, "read_history", "read_bytes", read_bytes, tick["now"])
+    append_rate(usage, "write_history", "write_bytes", write_bytes, tick["now"])
+
+
+def collect_ctx_switches(proc, usage, tick):
+    try:
+        ctx = proc.num_ctx_switches()
+        ctx_switches = ctx.voluntary + ctx.involuntary
+    except psutil.AccessDenied:
+        ctx_switches = None
+    append_rate(usage, "ctx_history", "ctx_switches", ctx_switches, tick["now"])
+
+
+def prepare_gpu(tick):
+    # One GPUtil query per pass: pid -> GPU utilisation
+    gpu_usage = {}
+    if HAS_GPU:
+        for gpu in GPUtil.getGPUs():
+            for p in getattr(gpu, "processes", []):
+                gpu_usage[p['pid']] = p['gpu_util']
+    tick["gpu_usage"] = gpu_usage
+
+
+def collect_gpu(proc, usage, tick):
+    usage["gpu_history"].append(tick["gpu_usage"].get(proc.pid, 0.0))
+
+
+# Provider name -> declared cost (relative, per process), metrics provided,
+# cumulative counters kept for rate metrics and callbacks
+METRIC_PROVIDERS = {
+    "cpu": {
+        "cost": 1,
+        "metrics": ('cpu_percent',),
+        "counters": (),
+        "prepare": None,
+        "collect": collect_cpu
+    },
+    "memory": {
+        "cost": 1,
+        "metrics": ('memory_percent',),
+        "counters": (),
+        "prepare": prepare_memory,
+        "collect": collect_memory
+    },
+    "disk_io": {
+        "cost": 2,
+        "metrics": ('read_bps', 'write_bps'),
+        "counters": ("read_bytes", "write_bytes"),
+        "prepare": None,
+        "collect": collect_disk_io
+    },
+    "ctx_switches": {
+        "cost": 2,
+        "metrics": ('ctx_switches_ps',),
+        "counters": ("ctx_switches",),
+        "prepare": None,
+        "collect": collect_ctx_switches
+    },
+    "gpu": {
+        "cost": 3,
+        "metrics": ('gpu_percent',),
+        "counters": (),
+        "prepare": prepare_gpu,
+        "collect": collect_gpu
+    }
+}
+
+
+# Seconds between the two readings backfill() takes for rate metrics
+BACKFILL_RATE_INTERVAL = 0.25
+
+
+def providers_for(metrics):
+    """Return the provider names needed for a set of metrics, cheapest first."""
+    names = [name for name, provider in METRIC_PROVIDERS.items()
+             if any(metric in metrics for metric in provider["metrics"])]
+    return sorted(names, key=lambda name: METRIC_PROVIDERS[name]["cost"])
+
+
+def collection_cost(metrics):
+    """Declared per-process cost of collecting a set of metrics."""
+    return sum(METRIC_PROVIDERS[name]["cost"] for name in providers_for(metrics))
+
+
+############################################################
+# Expensive attributes
+# Too costly to read for every process on every pass, so they are
+# refreshed on a rotating schedule under a per-tick time budget.
+# Each value is stored with the time it was read.
+############################################################
+def read_exe(proc):
+    return proc.exe()
+
+
+def read_username(proc):
+    return proc.username()
+
+
+def read_uss(proc):
+    return proc.memory_full_info().uss
+
+
+def read_open_files(proc):
+    return len(proc.open_files())
+
+
+def read_connections(proc):
+    # net_connections() replaced connections() in psutil 6
+    connections = getattr(proc, "net_connections", None) or proc.connections
+    return len(connections())
+
+
+def read_cmdline(proc):
+    return " ".join(proc.cmdline())
+
+
+EXPENSIVE_ATTRIBUTES = {
+    'exe': read_exe,
+    'username': read_username,
+    'uss': read_uss,
+    'open_files': read_open_files,
+    'connections': read_connections,
+    'cmdline': read_cmdline,
+    'is_system': is_system_process
+}
+
+# Seconds of expensive reads allowed per sampling pass, whatever the number of attributes
+ATTRIBUTE_BUDGET = 0.02
+
+# Values younger than this are not re-read
+ATTRIBUTE_MIN_AGE = 10.0
+
+# Rank at which a process is refreshed half as often as the busiest one
+ATTRIBUTE_RANK_SCALE = 10
+
+
+def rank_processes(rolling_usage):
+    """Return pid -> rank by latest CPU usage (0 = busiest)."""
+    latest = [(usage["cpu_history"][-1] if usage["cpu_history"] else 0.0, pid)
+              for pid, usage in rolling_usage.items()]
+    latest.sort(reverse=True)
+    return {pid: rank for rank, (_cpu, pid) in enumerate(latest)}
+
+
+def attribute_value(usage, attribute, now=None):
+    """Return (value, age in seconds) of an expensive attribute, or (None, None) if never read."""
+    sampled = usage["attributes"].get(attribute)
+    if sampled is None:
+        return None, None
+    now = time.monotonic() if now is None else now
+    return sampled[0], now - sampled[1]
+
+
+def new_usage(name, create_time, history_size):
+    """Create the rolling usage entry of a process."""
+    usage = {
+        "name": name,
+        "create_time": create_time,
+        "counters": {},  # Last cumulative counter values for rate metrics
+        "attributes": {}  # Expensive attribute -> (value, monotonic time it was read)
+    }
+    for history in METRIC_HISTORIES.values():
+        usage[history] = deque(maxlen=history_size)
+    return usage
+
+
+class MetricSampler:
+    """
+    Collects only the metrics that are currently needed.
+    The caller passes the set of required metrics on every pass; providers that are no longer
+    needed stop running and their stale histories are dropped, and providers that become
+    needed can be run on their own with backfill(). Expensive attributes are read separately
+    by sample_attributes() under a time budget.
+    """
+
+    def __init__(self, history_size=3):
+        self.history_size = history_size
+        self.num_cores = psutil.cpu_count(logical=True) or 1
+        self.active = set()  # Provider names collected on the last pass
+
+    def sample(self, process_map, rolling_usage, metrics):
+        """Run one sampling pass over process_map, updating rolling_usage in place."""
+        names = providers_for(metrics)
+        self.drop_inactive(rolling_usage, self.active - set(names))
+        self.active = set(names)
+        self.run_providers(process_map, rolling_usage, names)
+
+    def backfill(self, process_map, rolling_usage, metrics):
+        """Collect metrics that were not active on the last pass right away."""
+        names = [name for name in providers_for(metrics) if name not in self.active]
+        if not names:
+            return False
+        self.run_providers(process_map, rolling_usage, names)
+
+        # Rate providers only prime their counters on a first reading; take a second one shortly after
+        rate_names = [name for name in names if METRIC_PROVIDERS[name]["counters"]]
+        if rate_names:
+            time.sleep(BACKFILL_RATE_INTERVAL)
+            self.run_providers(process_map, rolling_usage, rate_names)
+
+        self.active |= set(names)
+        return True
+
+    def run_providers(self, process_map, rolling_usage, names):
+        providers = [METRIC_PROVIDERS[name] for name in names]
+        tick = {"now": time.monotonic(), "num_cores": self.num_cores}
+        for provider in providers:
+            if provider["prepare"]:
+                provider["prepare"](tick)
+
+        for pid, proc in process_map.items():
+            try:
+                with proc.oneshot():
+                    usage = rolling_usage.get(pid)
+                    if usage is None:
+                        usage = new_usage(proc.name(), proc.create_time(), self.history_size)
+                        rolling_usage[pid] = usage
+                    for provider in providers:
+                        provider["collect"](proc, usage, tick)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+
+    def sample_attributes(self, process_map, rolling_usage, attributes, ranks=None,
+                          budget=ATTRIBUTE_BUDGET):
+        """
+        Refresh expensive attributes until the time budget (seconds) is spent.
+        Every (process, attribute) value older than ATTRIBUTE_MIN_AGE is a candidate. Values
+        never read come first, then the rest by age weighted by the process rank (pid -> rank,
+        busiest first), so top processes stay fresh while the tail still rotates through.
+        budget=None reads every candidate. Returns the number of values read.
+        """
+        attributes = [attribute for attribute in attributes if attribute in EXPENSIVE_ATTRIBUTES]
+        if not attributes:
+            return 0
+        ranks = ranks or {}
+        now = time.monotonic()
+
+        candidates = []
+        for pid, usage in rolling_usage.items():
+            if pid not in process_map:
+                continue
+            weight = 1.0 / (1 + ranks.get(pid, len(ranks)) / ATTRIBUTE_RANK_SCALE)
+            for attribute in attributes:
+                sampled = usage["attributes"].get(attribute)
+                if sampled is None:
+                    candidates.append((math.inf, weight, pid, attribute))
+                elif now - sampled[1] >= ATTRIBUTE_MIN_AGE:
+                    candidates.append(((now - sampled[1]) * weight, weight, pid, attribute))
+        candidates.sort(key=lambda candidate: (candidate[0], candidate[1]), reverse=True)
+
+        start = time.perf_counter()
+        read = 0
+        for _priority, _weight, pid, attribute in candidates:
+            if budget is not None and time.perf_counter() - start >= budget:
+                break
+            try:
+                value = EXPENSIVE_ATTRIBUTES[attribute](process_map[pid])
+            except psutil.AccessDenied:
+                value = None  # Stored with its age too, so it is not retried every pass
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                continue
+            rolling_usage[pid]["attributes"][attribute] = (value, time.monotonic())
+            read += 1
+        return read
+
+    @staticmethod
+    def drop_inactive(rolling_usage, names):
+        """Forget the values of providers that stopped running so they never show stale data."""
+        if not names:
+            return
+        metrics = [metric for name in names for metric in METRIC_PROVIDERS[name]["metrics"]]
+        counters = [counter for name in names for counter in METRIC_PROVIDERS[name]["counters"]]
+        for usage in rolling_usage.values():
+            for metric in metrics:
+                usage[METRIC_HISTORIES[metric]].clear()
+            for counter in counters:
+                usage["counters"].pop(counter, None)
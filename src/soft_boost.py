@@ -0,0 +1,213 @@
+import os
+import threading
+
+import psutil
+
+from src.rule_matcher import normalize_name
+from src.utils import load_json_file, save_json_file
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOFT_BOOST_STATE_FILE = os.path.join(BASE_DIR, "config", "soft_boost_state.json")
+BOOST_RULES_FILE = os.path.join(BASE_DIR, "config", "boost_rules.json")
+
+# Serializes load-modify-save of the state file (the enforcement watchdog boosts from its own thread)
+RECORDS_LOCK = threading.RLock()
+
+# Boost actions (kill is handled by process_manager.safe_kill)
+ACTION_KILL = "kill"
+ACTION_DEMOTE = "demote"
+ACTION_AFFINITY = "affinity"
+ACTION_SUSPEND = "suspend"
+SOFT_ACTIONS = (ACTION_DEMOTE, ACTION_AFFINITY, ACTION_SUSPEND)
+
+# Priority used when demoting a process
+if psutil.WINDOWS:
+    DEMOTED_PRIORITY = psutil.IDLE_PRIORITY_CLASS
+else:
+    DEMOTED_PRIORITY = 19
+
+
+def background_cores():
+    """Return the small core set that demoted processes are restricted to."""
+    num_cores = psutil.cpu_count(logical=True) or 1
+    count = max(1, num_cores // 4)
+    return list(range(num_cores - count, num_cores))
+
+
+def _get_affinity(proc):
+    """Return the process CPU affinity, or None where it is not supported."""
+    try:
+        return proc.cpu_affinity()
+    except AttributeError:
+        return None
+
+
+def load_boost_records():
+    """Load the saved original settings of soft-boosted processes."""
+    with RECORDS_LOCK:
+        return load_json_file(SOFT_BOOST_STATE_FILE, "boosted_processes")
+
+
+def save_boost_records(records):
+    """Save the original settings of soft-boosted processes."""
+    with RECORDS_LOCK:
+        save_json_file(SOFT_BOOST_STATE_FILE, "boosted_processes", records)
+
+
+def record_original(proc, records, cpu_before=0.0):
+    """
+    Return the record holding the original settings of proc.
+    A new record is created from the current settings the first time a process is touched,
+    so repeated actions never overwrite the values a restore goes back to.
+    """
+    create_time = proc.create_time()
+    for record in records:
+        if record["pid"] == proc.pid and record["create_time"] == create_time:
+            return record
+
+    record = {
+        "pid": proc.pid,
+        "name": proc.name(),
+        "create_time": create_time,
+        "nice": proc.nice(),
+        "affinity": _get_affinity(proc),
+        "suspended": False,
+        "cpu_before": cpu_before
+    }
+    records.append(record)
+    return record
+
+
+def apply_action(proc, action, record, cores=None):
+    """Apply a single soft action to proc, updating its record."""
+    if action == ACTION_DEMOTE:
+        proc.nice(DEMOTED_PRIORITY)
+    elif action == ACTION_AFFINITY:
+        if record["affinity"] is None:
+            return False
+        proc.cpu_affinity(cores or background_cores())
+    elif action == ACTION_SUSPEND:
+        # Suspends are counted on Windows, so a second one would outlive the single resume
+        if not record["suspended"]:
+            proc.suspend()
+            record["suspended"] = True
+    else:
+        return False
+    return True
+
+
+def soft_boost(pids, action, cpu_usage=None):
+    """
+    Apply a reversible boost action to each PID.
+    cpu_usage maps pid -> current CPU % and is kept so the freed CPU can be measured later.
+    Returns the number of processes that were boosted.
+    """
+    cpu_usage = cpu_usage or {}
+    with RECORDS_LOCK:
+        records = load_boost_records()
+        boosted = 0
+
+        for pid in pids:
+            try:
+                proc = psutil.Process(pid)
+                record = record_original(proc, records, cpu_usage.get(pid, 0.0))
+                if apply_action(proc, action, record):
+                    boosted += 1
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+
+        save_boost_records(records)
+        return boosted
+
+
+def restore_record(record):
+    """
+    Put a process back to its recorded settings.
+    Returns True when the record is finished with (restored or process gone),
+    False when it should be kept for another attempt.
+    """
+    try:
+        proc = psutil.Process(record["pid"])
+        if proc.create_time() != record["create_time"]:
+            return True  # PID was reused by another process
+
+        if record["suspended"]:
+            proc.resume()
+        proc.nice(record["nice"])
+        if record["affinity"] is not None:
+            proc.cpu_affinity(record["affinity"])
+        return True
+    except (psutil.NoSuchProcess, psutil.ZombieProcess):
+        return True
+    except psutil.AccessDenied:
+        return False
+
+
+def restore_all():
+    """Undo every soft boost, including ones saved by a previous run. Returns the number restored."""
+    with RECORDS_LOCK:
+        records = load_boost_records()
+        remaining = []
+        restored = 0
+
+        for record in records:
+            if restore_record(record):
+                restored += 1
+            else:
+                remaining.append(record)
+
+        save_boost_records(remaining)
+        return restored
+
+
+def restore_pids(pids):
+    """Undo the saved settings of the given PIDs only. Returns the number restored."""
+    with RECORDS_LOCK:
+        records = load_boost_records()
+        remaining = []
+        restored = 0
+
+        for record in records:
+            if record["pid"] not in pids:
+                remaining.append(record)
+            elif restore_record(record):
+                restored += 1
+            else:
+                remaining.append(record)
+
+        save_boost_records(remaining)
+        return restored
+
+
+def cpu_freed(records, cpu_usage):
+    """
+    Measure the CPU % freed by soft boosts.
+    Compares the CPU usage recorded at boost time against cpu_usage (pid -> current CPU %).
+    """
+    freed = 0.0
+    for record in records:
+        pid = record["pid"]
+        if pid in cpu_usage:
+            freed += max(0.0, record.get("cpu_before", 0.0) - cpu_usage[pid])
+    return freed
+
+
+def load_boost_rules():
+    """Load the user-defined soft boost rules."""
+    return load_json_file(BOOST_RULES_FILE, "boost_rules")
+
+
+def match_boost_rule(proc_info, rules):
+    """
+    Return the action of the first rule matching proc_info, or None.
+    A rule matches on the process name and every threshold in its "when" block
+    (metric -> minimum value, e.g. {"cpu_percent": 5.0}).
+    """
+    name = normalize_name(proc_info['name'])
+    for rule in rules:
+        if normalize_name(rule.get("name", "")) != name:
+            continue
+        conditions = rule.get("when", {})
+        if all(proc_info.get(metric, 0.0) >= threshold for metric, threshold in conditions.items()):
+            return rule.get("action", ACTION_DEMOTE)
+    return None
@@ -0,0 +1,115 @@
+import psutil
+
+from src.rule_matcher import normalize_name
+from src.soft_boost import RECORDS_LOCK, load_boost_records, save_boost_records, record_original, restore_pids
+
+# Priority given to the boost target
+if psutil.WINDOWS:
+    TARGET_PRIORITY = psutil.HIGH_PRIORITY_CLASS
+else:
+    TARGET_PRIORITY = -5
+
+
+def split_cores(reserve_count=None):
+    """
+    Split the logical cores into (reserved, others).
+    By default half of the cores are reserved for the target, and at least one core is always
+    left for everything else. On a single-core machine nothing can be reserved.
+    """
+    num_cores = psutil.cpu_count(logical=True) or 1
+    all_cores = list(range(num_cores))
+    if num_cores < 2:
+        return all_cores, all_cores
+
+    reserve_count = reserve_count or max(1, num_cores // 2)
+    reserve_count = min(reserve_count, num_cores - 1)
+    return all_cores[:reserve_count], all_cores[reserve_count:]
+
+
+def create_target_profile(name=None, pid=None, reserve_count=None):
+    """Create a boost profile for the process chosen by name or by PID."""
+    reserved_cores, other_cores = split_cores(reserve_count)
+    return {
+        "name": normalize_name(name) if name else None,
+        "pid": pid,
+        "reserved_cores": reserved_cores,
+        "other_cores": other_cores,
+        "applied": set()  # PIDs whose settings this profile changed
+    }
+
+
+def is_target(profile, pid, name):
+    """Check whether a process is the profile's target."""
+    if profile["pid"] is not None:
+        return pid == profile["pid"]
+    return normalize_name(name) == profile["name"]
+
+
+def target_running(profile, process_map):
+    """Check whether at least one target process is still alive."""
+    for pid, proc in process_map.items():
+        try:
+            if is_target(profile, pid, proc.name()) and proc.is_running():
+                return True
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+    return False
+
+
+def try_setting(setter, value):
+    """Apply one process setting. Returns False when it is refused or not supported."""
+    try:
+        setter(value)
+        return True
+    except (psutil.AccessDenied, AttributeError):
+        return False
+
+
+def apply_target_profile(profile, process_map, is_protected=None):
+    """
+    Boost the target and push other processes off its reserved cores.
+    Only processes the profile has not handled yet are touched, so calling this on every
+    refresh is cheap and picks up newly spawned processes. Processes that are protected
+    (is_protected(name, pid), e.g. whitelisted) or already soft-boosted are left alone.
+    Returns the number of processes changed.
+    """
+    with RECORDS_LOCK:
+        records = load_boost_records()
+        already_boosted = {record["pid"] for record in records}
+        changed = 0
+
+        for pid, proc in process_map.items():
+            if pid in profile["applied"] or pid in already_boosted:
+                continue
+            try:
+                name = proc.name()
+                if is_target(profile, pid, name):
+                    record = record_original(proc, records)
+                    # Independent, so a refused priority raise still reserves the cores
+                    raised = try_setting(proc.nice, TARGET_PRIORITY)
+                    pinned = try_setting(proc.cpu_affinity, profile["reserved_cores"])
+                    applied = raised or pinned
+                elif is_protected is None or not is_protected(name, pid):
+                    record = record_original(proc, records)
+                    applied = try_setting(proc.cpu_affinity, profile["other_cores"])
+                else:
+                    continue
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, AttributeError):
+                continue
+
+            if not applied:
+                records.remove(record)  # Nothing to restore, and retried on the next refresh
+                continue
+            profile["applied"].add(pid)
+            changed += 1
+
+        if changed:
+            save_boost_records(records)
+        return changed
+
+
+def revert_target_profile(profile):
+    """Put every process changed by the profile back to its original settings."""
+    restored = restore_pids(profile["applied"])
+    profile["applied"].clear()
+    return restored
@@ -0,0 +1,51 @@
+import time
+
+import psutil
+
+
+class ThreadMonitor:
+    """
+    Per-thread CPU usage of a single process.
+    Each sample() reads threads() once and turns the CPU time deltas since the previous
+    sample into CPU % (of all cores, like the process table). Only exists while the
+    detail pane is open, so it costs nothing otherwise.
+    """
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.proc = psutil.Process(pid)
+        self.name = self.proc.name()
+        self.num_cores = psutil.cpu_count(logical=True) or 1
+        self.last_times = {}  # thread id -> user + system CPU seconds
+        self.last_sample = None
+
+    def sample(self, top=10):
+        """
+        Return the busiest threads as dicts with id, cpu_percent, user_time and system_time.
+        The first sample only primes the deltas, so every thread shows 0 %.
+        Raises psutil.NoSuchProcess once the process has exited.
+        """
+        threads = self.proc.threads()
+        now = time.monotonic()
+        elapsed = now - self.last_sample if self.last_sample is not None else 0.0
+
+        results = []
+        current_times = {}
+        for thread in threads:
+            cpu_time = thread.user_time + thread.system_time
+            current_times[thread.id] = cpu_time
+            previous = self.last_times.get(thread.id)
+            cpu_percent = 0.0
+            if previous is not None and elapsed > 0:
+                cpu_percent = max(0.0, cpu_time - previous) / elapsed * 100 / self.num_cores
+            results.append({
+                'id': thread.id,
+                'cpu_percent': cpu_percent,
+                'user_time': thread.user_time,
+                'system_time': thread.system_time
+            })
+
+        self.last_times = current_times
+        self.last_sample = now
+        results.sort(key=lambda x: x['cpu_percent'], reverse=True)
+        return results[:top]
@@ -0,0 +1,315 @@
+"""
+Compact binary trace of sampled snapshots.
+
+File layout (little-endian):
+    header   b"FPSTRACE", u16 version, u16 metric count, then each metric name as u8 length + utf-8
+    chunks   b"S" u32 string id, u16 length, utf-8 bytes         (string table entry)
+             b"F" f64 timestamp, u32 record count n, then columns: (snapshot frame)
+                  n x u32 pid, n x u32 name id, n x f64 create time, and n x f32 per metric
+
+Names are stored once in the string table and metrics are fixed-width columns, so a frame
+costs 20 + 4 * metrics bytes per process. Missing values are stored as NaN.
+
+    python -m src.trace config/traces/<file>.fpt --metric cpu_percent --top 10
+"""
+import argparse
+import bisect
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from datetime import datetime
+
+from src.sampler import METRIC_HISTORIES, new_usage
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRACE_DIR = os.path.join(BASE_DIR, "config", "traces")
+
+MAGIC = b"FPSTRACE"
+VERSION = 1
+TRACE_METRICS = tuple(METRIC_HISTORIES)
+
+STRING_TAG = b"S"
+FRAME_TAG = b"F"
+STRING_HEADER = struct.Struct("<IH")
+FRAME_HEADER = struct.Struct("<dI")
+
+# Columns are written with array.tobytes(), which uses the native byte order
+SWAP_BYTES = sys.byteorder == "big"
+
+
+def column_bytes(typecode, values):
+    column = array(typecode, values)
+    if SWAP_BYTES:
+        column.byteswap()
+    return column.tobytes()
+
+
+def new_trace_path():
+    """Return a timestamped trace file path in the traces folder."""
+    os.makedirs(TRACE_DIR, exist_ok=True)
+    return os.path.join(TRACE_DIR, datetime.now().strftime("trace-%Y%m%d-%H%M%S.fpt"))
+
+
+def latest_values(rolling_usage):
+    """Turn rolling usage into one snapshot record per process using the newest sample."""
+    snapshot = []
+    for pid, usage in rolling_usage.items():
+        record = {'pid': pid, 'name': usage["name"], 'create_time': usage["create_time"]}
+        for metric, history in METRIC_HISTORIES.items():
+            record[metric] = usage[history][-1] if usage[history] else math.nan
+        snapshot.append(record)
+    return snapshot
+
+
+class TraceRecorder:
+    """Appends snapshots to a trace file, continuing the string table of an existing file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.strings = {}
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            reader = TraceReader(path)
+            if reader.metrics != TRACE_METRICS:
+                reader.close()
+                raise ValueError(f"{path} was recorded with different metrics")
+            self.strings = {name: string_id for string_id, name in enumerate(reader.strings)}
+            end = reader.end
+            reader.close()
+            self.file = open(path, 'ab')
+            self.file.truncate(end)  # Drop a chunk left half-written by a crash
+        else:
+            self.file = open(path, 'wb')
+            self.file.write(MAGIC + struct.pack("<HH", VERSION, len(TRACE_METRICS)))
+            for metric in TRACE_METRICS:
+                encoded = metric.encode("utf-8")
+                self.file.write(struct.pack("<B", len(encoded)) + encoded)
+
+    def string_id(self, name):
+        """Return the id of name, appending it to the string table if it is new."""
+        if name not in self.strings:
+            string_id = len(self.strings)
+            encoded = name.encode("utf-8")
+            self.file.write(STRING_TAG + STRING_HEADER.pack(string_id, len(encoded)) + encoded)
+            self.strings[name] = string_id
+        return self.strings[name]
+
+    def record(self, snapshot, timestamp=None):
+        """Append one frame. snapshot is a list of dicts with pid, name, create_time and metrics."""
+        timestamp = time.time() if timestamp is None else timestamp
+        name_ids = [self.string_id(p['name']) for p in snapshot]
+
+        chunk = [FRAME_TAG, FRAME_HEADER.pack(timestamp, len(snapshot)),
+                 column_bytes('I', [p['pid'] for p in snapshot]),
+                 column_bytes('I', name_ids),
+                 column_bytes('d', [p['create_time'] for p in snapshot])]
+        for metric in TRACE_METRICS:
+            chunk.append(column_bytes('f', [p.get(metric, math.nan) for p in snapshot]))
+        self.file.write(b"".join(chunk))
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class TraceReader:
+    """
+    Memory-mapped trace reader.
+    Opening only walks the chunk headers to build the string table and a frame index,
+    frames are decoded on demand straight from the mapping.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f"{path} is empty")  # e.g. a crash right after recording started
+
+        try:
+            offset = self.read_header()
+        except (ValueError, struct.error, IndexError):
+            self.close()
+            raise ValueError(f"{path} is not an FPS Booster trace")
+
+        self.strings = []
+        self.timestamps = []
+        self.frames = []  # (offset of first column, record count)
+        self.index(offset)
+
+    def read_header(self):
+        """Parse the header into self.metrics and return the offset of the first chunk."""
+        if self.map[:len(MAGIC)] != MAGIC:
+            raise ValueError("bad magic")
+        offset = len(MAGIC)
+        _version, metric_count = struct.unpack_from("<HH", self.map, offset)
+        offset += 4
+        metrics = []
+        for _ in range(metric_count):
+            length = self.map[offset]
+            metrics.append(self.map[offset + 1:offset + 1 + length].decode("utf-8"))
+            offset += 1 + length
+        self.metrics = tuple(metrics)
+        return offset
+
+    def frame_size(self, count):
+        return count * (4 + 4 + 8 + 4 * len(self.metrics))
+
+    def index(self, offset):
+        size = len(self.map)
+        while offset < size:
+            tag = self.map[offset:offset + 1]
+            if tag == STRING_TAG and offset + 1 + STRING_HEADER.size <= size:
+                _string_id, length = STRING_HEADER.unpack_from(self.map, offset + 1)
+                start = offset + 1 + STRING_HEADER.size
+                if start + length > size:
+                    break
+                self.strings.append(self.map[start:start + length].decode("utf-8"))
+                offset = start + length
+            elif tag == FRAME_TAG and offset + 1 + FRAME_HEADER.size <= size:
+                timestamp, count = FRAME_HEADER.unpack_from(self.map, offset + 1)
+                start = offset + 1 + FRAME_HEADER.size
+                if start + self.frame_size(count) > size:
+                    break  # Truncated by a crash mid-write
+                self.timestamps.append(timestamp)
+                self.frames.append((start, count))
+                offset = start + self.frame_size(count)
+            else:
+                break
+        self.end = offset  # End of the last complete chunk
+
+    def __len__(self):
+        return len(self.frames)
+
+    def column(self, index, name):
+        """Return one column of a frame as an array ('pid', 'name', 'create_time' or a metric)."""
+        offset, count = self.frames[index]
+        if name == 'pid':
+            typecode, start = 'I', offset
+        elif name == 'name':
+            typecode, start = 'I', offset + 4 * count
+        elif name == 'create_time':
+            typecode, start = 'd', offset + 8 * count
+        else:
+            typecode = 'f'
+            start = offset + 16 * count + 4 * count * self.metrics.index(name)
+        values = array(typecode)
+        values.frombytes(self.map[start:start + values.itemsize * count])
+        if SWAP_BYTES:
+            values.byteswap()
+        return values
+
+    def frame(self, index):
+        """Decode a frame into a list of snapshot dicts."""
+        pids = self.column(index, 'pid')
+        name_ids = self.column(index, 'name')
+        create_times = self.column(index, 'create_time')
+        metric_columns = [(metric, self.column(index, metric)) for metric in self.metrics]
+
+        snapshot = []
+        for i in range(len(pids)):
+            record = {'pid': pids[i], 'name': self.strings[name_ids[i]], 'create_time': create_times[i]}
+            for metric, values in metric_columns:
+                record[metric] = values[i]
+            snapshot.append(record)
+        return snapshot
+
+    def frame_range(self, start=None, end=None):
+        """Return the frame indexes whose timestamps fall in [start, end]."""
+        first = 0 if start is None else bisect.bisect_left(self.timestamps, start)
+        last = len(self.timestamps) if end is None else bisect.bisect_right(self.timestamps, end)
+        return range(first, last)
+
+    def top(self, metric, start=None, end=None, count=10):
+        """Average a metric per process name over a time range and return the top consumers."""
+        totals = {}
+        frames = self.frame_range(start, end)
+        for index in frames:
+            for name_id, value in zip(self.column(index, 'name'), self.column(index, metric)):
+                if not math.isnan(value):
+                    totals[name_id] = totals.get(name_id, 0.0) + value
+        if not frames:
+            return []
+        ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:count]
+        return [(self.strings[name_id], total / len(frames)) for name_id, total in ranked]
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+class TraceReplaySource:
+    """Feeds recorded frames into rolling usage in place of live psutil sampling."""
+
+    def __init__(self, path, loop=True):
+        self.reader = TraceReader(path)
+        self.loop = loop
+        self.position = 0
+
+    def next_frame(self):
+        """Return the next recorded snapshot, or None when the trace is exhausted."""
+        if self.position >= len(self.reader):
+            if not self.loop or len(self.reader) == 0:
+                return None
+            self.position = 0
+        snapshot = self.reader.frame(self.position)
+        self.position += 1
+        return snapshot
+
+    def apply(self, rolling_usage, history_size):
+        """Replace rolling_usage with the state of the next frame. Returns False at the end."""
+        snapshot = self.next_frame()
+        if snapshot is None:
+            return False
+
+        live = set()
+        for record in snapshot:
+            pid = record['pid']
+            live.add(pid)
+            usage = rolling_usage.get(pid)
+            if usage is None or usage["create_time"] != record['create_time']:
+                usage = new_usage(record['name'], record['create_time'], history_size)
+                rolling_usage[pid] = usage
+            for metric, history in METRIC_HISTORIES.items():
+                value = record.get(metric, math.nan)
+                if not math.isnan(value):
+                    usage[history].append(value)
+
+        for pid in list(rolling_usage):
+            if pid not in live:
+                del rolling_usage[pid]
+        return True
+
+    def close(self):
+        self.reader.close()
+
+
+def parse_time(text):
+    return datetime.fromisoformat(text).timestamp() if text else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the top processes of a recorded trace.")
+    parser.add_argument("path", help="Trace file")
+    parser.add_argument("--metric", default="cpu_percent", choices=TRACE_METRICS)
+    parser.add_argument("--start", default=None, help="ISO start time, e.g. 2024-05-01T21:00")
+    parser.add_argument("--end", default=None, help="ISO end time")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    reader = TraceReader(args.path)
+    frames = reader.frame_range(parse_time(args.start), parse_time(args.end))
+    print(f"{len(frames)} of {len(reader)} frames in range")
+    for name, value in reader.top(args.metric, parse_time(args.start), parse_time(args.end), args.top):
+        print(f"{value:12.2f}  {name}")
+    reader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import threading
+import time
+from collections import deque
+
+import psutil
+
+from src.sampler import is_system_process
+from src.soft_boost import ACTION_KILL, SOFT_ACTIONS, soft_boost
+
+
+class EnforcementWatchdog:
+    """
+    Low-latency enforcement of the blacklist between full refreshes.
+    Each poll() only diffs the PID list against the previous poll and looks up the names of
+    new PIDs, so it is cheap enough to run every ~100 ms. start() polls on a background thread
+    so that a busy or blocked UI thread cannot delay enforcement. Processes that respawn in a loop are
+    put in an exponential backoff instead of being acted on forever. Whitelisted and system
+    processes are never acted on, however broad the blacklist entry that matched them.
+
+    New PIDs that do not match are rechecked for recheck_polls polls, because on fork+exec
+    platforms the first look can still see the parent's image name. Latency is measured from
+    the poll that first saw the PID, so the time between spawn and that poll (at most one poll
+    interval) is not included; process create times are too coarse for this (whole-second
+    boot time on Linux).
+    """
+
+    def __init__(self, action=ACTION_KILL, target_latency=0.25, respawn_limit=3,
+                 respawn_window=30.0, base_backoff=5.0, max_backoff=300.0, recheck_polls=5):
+        self.action = action
+        self.target_latency = target_latency
+        self.respawn_limit = respawn_limit
+        self.respawn_window = respawn_window
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.recheck_polls = recheck_polls
+
+        self.blacklist = None
+        self.whitelist = None
+        self.known_pids = set(psutil.pids())
+        self.pending = {}  # Unmatched new pid -> [time first seen, polls left]
+
+        # Respawn loop detection: name -> action timestamps / backoff state
+        self.recent_actions = {}
+        self.backoff_until = {}
+        self.backoff_level = {}
+
+        # Counters
+        self.actions_taken = {action_name: 0 for action_name in (ACTION_KILL,) + SOFT_ACTIONS}
+        self.failed = 0
+        self.skipped_backoff = 0
+        self.skipped_protected = 0
+        self.over_target = 0
+        self.latencies = deque(maxlen=200)
+        self.lock = threading.Lock()  # Guards the counters, which the UI thread reads
+
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def set_blacklist(self, matcher):
+        """Replace the cached blacklist with a compiled RuleMatcher."""
+        self.blacklist = matcher
+
+    def set_whitelist(self, matcher):
+        """Replace the cached whitelist with a compiled RuleMatcher."""
+        self.whitelist = matcher
+
+    def is_protected(self, proc, name, create_time):
+        """Apply the same protections as safe_kill, without prompting."""
+        if name == "mpdefendercoreservice.exe":
+            return True
+        if self.whitelist is not None and self.whitelist.match(proc.pid, name, create_time):
+            return True
+        return is_system_process(proc)
+
+    def start(self, interval=0.1):
+        """Start polling every interval seconds on a background thread."""
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, args=(interval,), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the polling thread."""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def run(self, interval):
+        while not self.stop_event.wait(interval):
+            try:
+                self.poll()
+            except (psutil.Error, OSError):
+                # Keep enforcing; a failed state file write must not end the thread
+                with self.lock:
+                    self.failed += 1
+
+    def poll(self):
+        """Check for newly spawned PIDs and enforce the blacklist on them. Returns actions taken."""
+        seen = time.time()
+        pids = set(psutil.pids())
+        for pid in pids - self.known_pids:
+            self.pending[pid] = [seen, self.recheck_polls]
+        self.known_pids = pids
+        if self.blacklist is None:
+            self.pending.clear()
+            return 0
+
+        taken = 0
+        for pid, entry in list(self.pending.items()):
+            first_seen = entry[0]
+            if pid not in pids:
+                del self.pending[pid]  # Exited before it was matched
+                continue
+            try:
+                proc = psutil.Process(pid)
+                name = proc.name().lower()
+                if not self.blacklist.match(pid, name):
+                    # Possibly still the parent's image before exec, look again next poll
+                    entry[1] -= 1
+                    if entry[1] <= 0:
+                        del self.pending[pid]
+                    continue
+                del self.pending[pid]
+                create_time = proc.create_time()
+                if self.is_protected(proc, name, create_time):
+                    with self.lock:
+                        self.skipped_protected += 1
+                    continue
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                self.pending.pop(pid, None)
+                continue
+            except psutil.AccessDenied:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    self.pending.pop(pid, None)
+                continue
+
+            now = time.time()
+            if self.in_backoff(name, now):
+                with self.lock:
+                    self.skipped_backoff += 1
+                continue
+
+            action = self.action
+            if not self.enforce(proc, action):
+                with self.lock:
+                    self.failed += 1
+                continue
+
+            done = time.time()
+            latency = max(0.0, done - first_seen)
+            with self.lock:
+                self.latencies.append(latency)
+                if latency > self.target_latency:
+                    self.over_target += 1
+                self.actions_taken[action] += 1
+                self.record_action(name, done)
+            taken += 1
+        return taken
+
+    def enforce(self, proc, action):
+        """Apply an action to a single process."""
+        if action == ACTION_KILL:
+            try:
+                proc.kill()
+                return True
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                return False
+        return soft_boost([proc.pid], action) > 0
+
+    def in_backoff(self, name, now):
+        """Check whether a respawning process is currently being left alone."""
+        return self.backoff_until.get(name, 0.0) > now
+
+    def record_action(self, name, now):
+        """Track actions per name and start a backoff when a respawn loop is detected."""
+        history = self.recent_actions.setdefault(name, deque())
+        while history and now - history[0] > self.respawn_window:
+            history.popleft()
+        if not history:
+            self.backoff_level[name] = 0  # Quiet for a whole window, forget old loops
+        history.append(now)
+
+        if len(history) >= self.respawn_limit:
+            level = self.backoff_level.get(name, 0)
+            self.backoff_until[name] = now + min(self.base_backoff * 2 ** level, self.max_backoff)
+            self.backoff_level[name] = level + 1
+
+    def stats(self):
+        """Return a copy of the latency and action counters."""
+        with self.lock:
+            latencies = sorted(self.latencies)
+            count = len(latencies)
+            now = time.time()
+            return {
+                "actions": dict(self.actions_taken),
+                "failed": self.failed,
+                "skipped_backoff": self.skipped_backoff,
+                "skipped_protected": self.skipped_protected,
+                "over_target": self.over_target,
+                "in_backoff": [name for name in self.backoff_until if self.in_backoff(name, now)],
+                "last_latency": self.latencies[-1] if count else 0.0,
+                "avg_latency": sum(latencies) / count if count else 0.0,
+                "p95_latency": latencies[min(count - 1, int(count * 0.95))] if count else 0.0,
+                "max_latency": latencies[-1] if count else 0.0
+            }